@@ -1,4 +1,6 @@
 from fastapi import APIRouter
+from starlette.types import ASGIApp, Receive, Scope, Send
+
 from app.api.routes import (
     claude,
     claude_extra,
@@ -8,6 +10,7 @@ from app.api.routes import (
     proxies,
     conversation_logs,
 )
+from app.core.config import settings as app_settings
 
 api_router = APIRouter()
 
@@ -15,9 +18,6 @@ api_router.include_router(claude.router, prefix="/v1", tags=["Claude API"])
 api_router.include_router(
     claude_extra.router, prefix="/v1", tags=["Claude Extra API"]
 )
-api_router.include_router(
-    claude_extra.router, prefix="/api/v1", tags=["Claude Extra API (API prefix)"]
-)
 api_router.include_router(
     accounts.router, prefix="/api/admin/accounts", tags=["Account Management"]
 )
@@ -30,8 +30,39 @@ api_router.include_router(
 api_router.include_router(
     proxies.router, prefix="/api/admin/proxies", tags=["Proxy Pool Management"]
 )
-api_router.include_router(
-    conversation_logs.router,
-    prefix="/api/admin/conversation-logs",
-    tags=["Conversation Logs"],
-)
+if app_settings.enable_conversation_logging:
+    api_router.include_router(
+        conversation_logs.router,
+        prefix="/api/admin/conversation-logs",
+        tags=["Conversation Logs"],
+    )
+
+
+class ClaudeExtraAliasMiddleware:
+    """
+    Serve the Claude extra API under /api/v1 as well as /v1.
+
+    Instead of mounting claude_extra.router twice (which duplicates every route
+    in the matcher), requests for /api/v1/<extra route> are rewritten to
+    /v1/<extra route> before routing. Other /api/v1 paths are left untouched.
+    """
+
+    alias_prefix = "/api/v1"
+    target_prefix = "/v1"
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._path_regexes = [route.path_regex for route in claude_extra.router.routes]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path.startswith(self.alias_prefix + "/"):
+                sub_path = path[len(self.alias_prefix) :]
+                if any(regex.match(sub_path) for regex in self._path_regexes):
+                    new_path = self.target_prefix + sub_path
+                    scope = dict(scope)
+                    scope["path"] = new_path
+                    scope["raw_path"] = new_path.encode()
+
+        await self.app(scope, receive, send)
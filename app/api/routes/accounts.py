@@ -7,10 +7,12 @@ import re
 
 from app.core.exceptions import OAuthExchangeError
 from app.dependencies.auth import AdminAuthDep
-from app.services.account import account_manager
+from app.services.account import account_manager, cookie_key
 from app.core.account import AuthType, AccountStatus, OAuthToken
 from app.services.oauth import oauth_authenticator
 
+_PROXY_MASK_RE = re.compile(r"^(socks5://)([\w.-]+):([\w.-]+)@([\w.-]+:\d+)$")
+
 
 class OAuthTokenCreate(BaseModel):
     access_token: str
@@ -60,7 +62,7 @@ def mask_proxy_url(url: str) -> str:
     """Mask credentials in proxy URL for display."""
     if not url:
         return ""
-    match = re.match(r"^(socks5://)([\w.-]+):([\w.-]+)@([\w.-]+:\d+)$", url)
+    match = _PROXY_MASK_RE.match(url)
     if match:
         protocol, _, __, host_port = match.groups()
         return f"{protocol}***:***@{host_port}"
@@ -84,8 +86,8 @@ def get_account_response(org_uuid: str, account) -> AccountResponse:
         is_pro=account.is_pro,
         is_max=account.is_max,
         has_oauth=account.oauth_token is not None,
-        last_used=account.last_used.isoformat(),
-        resets_at=account.resets_at.isoformat() if account.resets_at else None,
+        last_used=account.last_used_iso,
+        resets_at=account.resets_at_iso,
         assigned_proxy=masked_proxy,
     )
 
@@ -145,14 +147,13 @@ async def update_account(
     # Update fields if provided
     if account_data.cookie_value is not None:
         # Remove old cookie mapping if exists
-        if (
-            account.cookie_value
-            and account.cookie_value in account_manager._cookie_to_uuid
-        ):
-            del account_manager._cookie_to_uuid[account.cookie_value]
+        if account.cookie_value:
+            account_manager._cookie_to_uuid.pop(cookie_key(account.cookie_value), None)
 
         account.cookie_value = account_data.cookie_value
-        account_manager._cookie_to_uuid[account_data.cookie_value] = organization_uuid
+        account_manager._cookie_to_uuid[cookie_key(account_data.cookie_value)] = (
+            organization_uuid
+        )
 
     if account_data.oauth_token is not None:
         account.oauth_token = OAuthToken(
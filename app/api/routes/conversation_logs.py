@@ -1,7 +1,11 @@
-from typing import Optional, List
-from fastapi import APIRouter, Query, HTTPException
+from typing import Any, AsyncIterator, Dict, Optional, List
+
+import orjson
+from fastapi import APIRouter, Header, Query, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from app.core.orjson_response import ORJSONResponse
 from app.dependencies.auth import AdminAuthDep
 from app.services.conversation_logger import get_conversation_logger
 
@@ -30,12 +34,29 @@ class ConversationLogsListResponse(BaseModel):
     logs: List[ConversationLogResponse]
 
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 
+async def _stream_logs(logs: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """查询到一条就序列化一条，以 NDJSON 格式输出"""
+    async for log in logs:
+        yield orjson.dumps(log) + b"\n"
 
-@router.get("", response_model=ConversationLogsListResponse)
+
+@router.get(
+    "",
+    responses={
+        200: {
+            "model": ConversationLogsListResponse,
+            "content": {NDJSON_MEDIA_TYPE: {}},
+        }
+    },
+)
 async def get_conversation_logs(
     _: AdminAuthDep,
+    accept: Optional[str] = Header(None, include_in_schema=False),
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     session_id: Optional[str] = Query(None, description="Filter by session ID"),
@@ -47,11 +68,23 @@ async def get_conversation_logs(
     查询对话日志列表
 
     需要管理员权限。支持按日期、session_id、状态筛选。
+    请求头 Accept 为 application/x-ndjson 时，以 NDJSON 流式返回日志记录（每行一条）。
     """
     conversation_logger = get_conversation_logger()
     if not conversation_logger:
         raise HTTPException(status_code=503, detail="Conversation logger not initialized")
 
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        logs = conversation_logger.iter_logs(
+            start_date=start_date,
+            end_date=end_date,
+            session_id=session_id,
+            status=status,
+            limit=limit,
+            offset=offset,
+        )
+        return StreamingResponse(_stream_logs(logs), media_type=NDJSON_MEDIA_TYPE)
+
     logs = await conversation_logger.query_logs(
         start_date=start_date,
         end_date=end_date,
@@ -61,10 +94,11 @@ async def get_conversation_logs(
         offset=offset,
     )
 
-    return ConversationLogsListResponse(total=len(logs), logs=logs)
+    # 日志记录本身就是 JSON 解码得到的字典，直接序列化，跳过模型校验和 jsonable_encoder
+    return ORJSONResponse({"total": len(logs), "logs": logs})
 
 
-@router.get("/{log_id}", response_model=ConversationLogResponse)
+@router.get("/{log_id}", responses={200: {"model": ConversationLogResponse}})
 async def get_conversation_log(log_id: str, _: AdminAuthDep):
     """
     获取单条对话日志详情
@@ -80,7 +114,7 @@ async def get_conversation_log(log_id: str, _: AdminAuthDep):
     if not log:
         raise HTTPException(status_code=404, detail="Log not found")
 
-    return ConversationLogResponse(**log)
+    return ORJSONResponse(log)
 
 
 @router.delete("")
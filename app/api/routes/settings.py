@@ -1,8 +1,7 @@
 import os
-import json
 from typing import List
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, HttpUrl, ValidationError
 
 from app.dependencies.auth import AdminAuthDep
 from app.core.config import Settings, settings
@@ -77,23 +76,22 @@ async def update_settings(_: AdminAuthDep, updates: SettingsUpdate) -> Settings:
     update_dict = updates.model_dump(exclude_unset=True)
 
     if not settings.no_filesystem_mode:
-        config_path = settings.data_folder / "config.json"
-        settings.data_folder.mkdir(parents=True, exist_ok=True)
-
-        if os.path.exists(config_path):
-            try:
-                with open(config_path, "r", encoding="utf-8") as f:
-                    config_data = SettingsUpdate.model_validate_json(f.read())
-            except (json.JSONDecodeError, IOError):
-                config_data = SettingsUpdate()
-        else:
+        config_path = settings.ensure_data_folder() / "config.json"
+
+        # A missing file raises FileNotFoundError (an IOError) and starts empty
+        try:
+            config_data = SettingsUpdate.model_validate_json(config_path.read_bytes())
+        except (ValidationError, IOError):
             config_data = SettingsUpdate()
 
         config_data = config_data.model_copy(update=update_dict)
 
         try:
-            with open(config_path, "w", encoding="utf-8") as f:
-                f.write(config_data.model_dump_json(exclude_unset=True))
+            tmp_path = config_path.with_suffix(".json.tmp")
+            tmp_path.write_text(
+                config_data.model_dump_json(exclude_unset=True), encoding="utf-8"
+            )
+            os.replace(tmp_path, config_path)
         except IOError as e:
             raise HTTPException(
                 status_code=500, detail=f"Failed to save config: {str(e)}"
@@ -103,4 +101,7 @@ async def update_settings(_: AdminAuthDep, updates: SettingsUpdate) -> Settings:
         if hasattr(settings, key):
             setattr(settings, key, value)
 
+    if "proxy_pool" in update_dict:
+        settings._proxy_pool_set = set(settings.proxy_pool)
+
     return settings
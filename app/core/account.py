@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from enum import Enum
 from datetime import datetime
 from dataclasses import dataclass
@@ -23,6 +23,24 @@ class AuthType(str, Enum):
     BOTH = "both"
 
 
+# Bit flags for the auth methods an account can serve
+COOKIE_AUTH = 1
+OAUTH_AUTH = 2
+
+AUTH_TYPE_MASKS = {
+    AuthType.COOKIE_ONLY: COOKIE_AUTH,
+    AuthType.OAUTH_ONLY: OAUTH_AUTH,
+    AuthType.BOTH: COOKIE_AUTH | OAUTH_AUTH,
+}
+
+# Capability substrings that mark an account as pro
+_PRO_KEYWORDS = ("pro", "enterprise", "raven", "max")
+
+# Bit flags for capability tiers, see Account.capability_mask
+PRO_CAPABILITY = 1
+MAX_CAPABILITY = 2
+
+
 @dataclass
 class OAuthToken:
     """Encapsulates OAuth credentials for an account."""
@@ -49,9 +67,43 @@ class OAuthToken:
         )
 
 
+class _TrackedField:
+    """Account attribute whose writes add the account to change sets.
+
+    Only __set__ is defined, so reads find the value in the instance
+    __dict__ without calling back into Python; writes to untracked fields
+    such as last_used are not intercepted at all.
+    """
+
+    def __init__(self, *changes: Set["Account"]):
+        self._changes = changes
+
+    def __set_name__(self, owner, name: str) -> None:
+        self._name = name
+
+    def __set__(self, instance: "Account", value) -> None:
+        instance.__dict__[self._name] = value
+        for changes in self._changes:
+            changes.add(instance)
+
+
 class Account:
     """Represents a Claude.ai account with cookie and/or OAuth authentication."""
 
+    # Accounts written since AccountManager last caught up, for its selection
+    # buckets, rate limit recovery heap and token refresh heap respectively.
+    # These fields are also set outside AccountManager, so it drains the sets
+    # to update only the affected accounts.
+    index_changes: Set["Account"] = set()
+    reset_changes: Set["Account"] = set()
+    refresh_changes: Set["Account"] = set()
+
+    status = _TrackedField(index_changes, reset_changes)
+    auth_type = _TrackedField(index_changes, refresh_changes)
+    capabilities = _TrackedField(index_changes)
+    resets_at = _TrackedField(reset_changes)
+    oauth_token = _TrackedField(refresh_changes)
+
     def __init__(
         self,
         organization_uuid: str,
@@ -68,6 +120,8 @@ class Account:
         self.last_used = datetime.now()
         self.resets_at: Optional[datetime] = None
         self.oauth_token: Optional[OAuthToken] = oauth_token
+        # field name -> (datetime, its isoformat()), see _cached_isoformat
+        self._isoformat_cache: Dict[str, Tuple[datetime, str]] = {}
 
     def __enter__(self) -> "Account":
         """Enter the context manager."""
@@ -119,8 +173,8 @@ class Account:
             "cookie_value": self.cookie_value,
             "status": self.status.value,
             "auth_type": self.auth_type.value,
-            "last_used": self.last_used.isoformat(),
-            "resets_at": self.resets_at.isoformat() if self.resets_at else None,
+            "last_used": self.last_used_iso,
+            "resets_at": self.resets_at_iso,
             "oauth_token": self.oauth_token.to_dict() if self.oauth_token else None,
         }
 
@@ -150,11 +204,10 @@ class Account:
         if not self.capabilities:
             return False
 
-        pro_keywords = ["pro", "enterprise", "raven", "max"]
         return any(
             keyword in cap.lower()
             for cap in self.capabilities
-            for keyword in pro_keywords
+            for keyword in _PRO_KEYWORDS
         )
 
     @property
@@ -165,6 +218,40 @@ class Account:
 
         return any("max" in cap.lower() for cap in self.capabilities)
 
+    def _cached_isoformat(self, field: str) -> Optional[str]:
+        """Return the field's isoformat(), reused while its value is unchanged."""
+        value = getattr(self, field)
+        if value is None:
+            return None
+
+        cached = self._isoformat_cache.get(field)
+        if cached is None or cached[0] is not value:
+            cached = (value, value.isoformat())
+            self._isoformat_cache[field] = cached
+        return cached[1]
+
+    @property
+    def last_used_iso(self) -> str:
+        """ISO 8601 form of last_used."""
+        return self._cached_isoformat("last_used")
+
+    @property
+    def resets_at_iso(self) -> Optional[str]:
+        """ISO 8601 form of resets_at, or None if not rate limited."""
+        return self._cached_isoformat("resets_at")
+
+    @property
+    def auth_mask(self) -> int:
+        """Auth methods this account can serve as COOKIE_AUTH/OAUTH_AUTH bits."""
+        return AUTH_TYPE_MASKS[self.auth_type]
+
+    @property
+    def capability_mask(self) -> int:
+        """is_pro and is_max as PRO_CAPABILITY/MAX_CAPABILITY bits."""
+        return (PRO_CAPABILITY if self.is_pro else 0) | (
+            MAX_CAPABILITY if self.is_max else 0
+        )
+
     def __repr__(self) -> str:
         """String representation of the Account."""
         return f"<Account organization_uuid={self.organization_uuid[:8]}... status={self.status.value} auth_type={self.auth_type.value}>"
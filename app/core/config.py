@@ -1,9 +1,9 @@
 import os
 import json
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field, HttpUrl, field_validator
+from pydantic import Field, HttpUrl, PrivateAttr, field_validator
 from dotenv import load_dotenv
 
 class Settings(BaseSettings):
@@ -143,6 +143,10 @@ class Settings(BaseSettings):
         env="PROXY_POOL",
         description="Comma-separated list of SOCKS5 proxy URLs for proxy pool",
     )
+    # Mirror of proxy_pool for O(1) membership checks; must be kept in sync
+    _proxy_pool_set: Set[str] = PrivateAttr(default_factory=set)
+    # Set once data_folder has been created, so persistence paths skip mkdir
+    _data_folder_ready: bool = PrivateAttr(default=False)
 
     # Content processing
     custom_prompt: Optional[str] = Field(default=None, env="CUSTOM_PROMPT")
@@ -212,6 +216,11 @@ class Settings(BaseSettings):
         env="ACCOUNT_TASK_INTERVAL",
         description="Interval for account management task in seconds",
     )
+    max_concurrent_refreshes: int = Field(
+        default=8,
+        env="MAX_CONCURRENT_REFRESHES",
+        description="Maximum number of OAuth token refreshes running at once",
+    )
 
     # Tool call settings
     tool_call_timeout: int = Field(
@@ -282,6 +291,11 @@ class Settings(BaseSettings):
         env="CONVERSATION_LOG_RETENTION_DAYS",
         description="Number of days to keep conversation logs",
     )
+    conversation_log_compress: bool = Field(
+        default=False,
+        env="CONVERSATION_LOG_COMPRESS",
+        description="Compress past days' conversation logs with zstd (requires zstandard)",
+    )
 
     @property
     def conversation_log_path(self) -> Path:
@@ -290,6 +304,21 @@ class Settings(BaseSettings):
             return self.conversation_log_dir
         return self.data_folder / "logs" / "conversations"
 
+    def ensure_data_folder(self) -> Path:
+        """Create data_folder on first use and remember that it exists.
+
+        Returns:
+            The data folder path
+        """
+        if not self._data_folder_ready:
+            self.data_folder.mkdir(parents=True, exist_ok=True)
+            self._data_folder_ready = True
+        return self.data_folder
+
+    def model_post_init(self, __context: Any) -> None:
+        """Build derived indexes after settings are loaded."""
+        self._proxy_pool_set = set(self.proxy_pool)
+
     @field_validator(
         "api_keys", "admin_api_keys", "cookies", "max_models", "pad_tokens", "proxy_pool"
     )
@@ -1,6 +1,8 @@
+from dataclasses import dataclass
 from typing import Optional, Annotated
 from loguru import logger
-from fastapi import Depends, Header
+from fastapi import Depends, Request
+from starlette.types import ASGIApp, Receive, Scope, Send
 import secrets
 
 from app.core.config import settings
@@ -18,10 +20,18 @@ if not settings.admin_api_keys:
     )
 
 
-async def get_api_key(
-    x_api_key: Annotated[Optional[str], Header()] = None,
-    authorization: Annotated[Optional[str], Header()] = None,
-) -> str:
+@dataclass(frozen=True, slots=True)
+class AuthPrincipal:
+    """API key extracted from a request, with the roles it grants."""
+
+    api_key: Optional[str]
+    is_user: bool
+    is_admin: bool
+
+
+def _extract_api_key(
+    x_api_key: Optional[str], authorization: Optional[str]
+) -> Optional[str]:
     # Check X-API-Key header
     api_key = x_api_key
 
@@ -30,6 +40,75 @@ async def get_api_key(
         if authorization.startswith("Bearer "):
             api_key = authorization[7:]
 
+    return api_key or None
+
+
+def resolve_principal(
+    x_api_key: Optional[str], authorization: Optional[str]
+) -> AuthPrincipal:
+    """Parse the auth headers and check the key against configured keys.
+
+    Args:
+        x_api_key: Value of the X-API-Key header
+        authorization: Value of the Authorization header
+
+    Returns:
+        The resolved principal; both roles are False for missing or unknown keys
+    """
+    api_key = _extract_api_key(x_api_key, authorization)
+    if not api_key:
+        return AuthPrincipal(api_key=None, is_user=False, is_admin=False)
+
+    is_admin = api_key in settings.admin_api_keys or api_key == _temp_admin_api_key
+    is_user = is_admin or api_key in settings.api_keys
+    return AuthPrincipal(api_key=api_key, is_user=is_user, is_admin=is_admin)
+
+
+class AuthMiddleware:
+    """
+    Resolve the API key once per request and store it in request.state.auth.
+
+    The middleware never rejects requests itself; AuthDep and AdminAuthDep
+    read the stored principal and raise InvalidAPIKeyError, so public routes
+    and the app's exception handlers behave as before.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            x_api_key = None
+            authorization = None
+            for name, value in scope["headers"]:
+                # First occurrence wins, matching Request.headers.get()
+                if name == b"x-api-key" and x_api_key is None:
+                    x_api_key = value.decode("latin-1")
+                elif name == b"authorization" and authorization is None:
+                    authorization = value.decode("latin-1")
+
+            scope = dict(scope)
+            scope["state"] = {
+                **scope.get("state", {}),
+                "auth": resolve_principal(x_api_key, authorization),
+            }
+
+        await self.app(scope, receive, send)
+
+
+def _get_principal(request: Request) -> AuthPrincipal:
+    principal = getattr(request.state, "auth", None)
+    if principal is None:
+        # AuthMiddleware is not installed (e.g. the router is mounted elsewhere)
+        principal = resolve_principal(
+            request.headers.get("x-api-key"), request.headers.get("authorization")
+        )
+    return principal
+
+
+async def get_api_key(request: Request) -> str:
+    api_key = _get_principal(request).api_key
+
     if not api_key:
         raise InvalidAPIKeyError()
 
@@ -39,41 +118,25 @@ async def get_api_key(
 APIKeyDep = Annotated[str, Depends(get_api_key)]
 
 
-async def verify_api_key(
-    api_key: APIKeyDep,
-) -> str:
-    # Verify against configured keys
-    valid_keys = settings.api_keys + settings.admin_api_keys + [_temp_admin_api_key]
+async def verify_api_key(request: Request) -> str:
+    principal = _get_principal(request)
 
-    if not valid_keys:
-        logger.error("No API keys configured, Please configure at least one API key.")
+    if not principal.is_user:
         raise InvalidAPIKeyError()
 
-    if api_key not in valid_keys:
-        raise InvalidAPIKeyError()
-
-    return api_key
+    return principal.api_key
 
 
 AuthDep = Annotated[str, Depends(verify_api_key)]
 
 
-async def verify_admin_api_key(
-    api_key: APIKeyDep,
-) -> str:
-    # Verify against configured admin keys
-    valid_keys = settings.admin_api_keys + [_temp_admin_api_key]
+async def verify_admin_api_key(request: Request) -> str:
+    principal = _get_principal(request)
 
-    if not valid_keys:
-        logger.error(
-            "No admin API keys configured, Please configure at least one admin API key."
-        )
-        raise InvalidAPIKeyError()
-
-    if api_key not in valid_keys:
+    if not principal.is_admin:
         raise InvalidAPIKeyError()
 
-    return api_key
+    return principal.api_key
 
 
 AdminAuthDep = Annotated[str, Depends(verify_admin_api_key)]
@@ -3,11 +3,12 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.main import api_router
+from app.api.main import api_router, ClaudeExtraAliasMiddleware
 from app.core.config import settings
 from app.core.error_handler import app_exception_handler
 from app.core.exceptions import AppError
 from app.core.static import register_static_routes
+from app.dependencies.auth import AuthMiddleware
 from app.utils.logger import configure_logger
 from app.services.account import account_manager
 from app.services.session import session_manager
@@ -31,6 +32,7 @@ async def lifespan(app: FastAPI):
         init_conversation_logger(
             log_dir=settings.conversation_log_path,
             retention_days=settings.conversation_log_retention_days,
+            compress=settings.conversation_log_compress,
         )
         logger.info("Conversation logging enabled")
     else:
@@ -48,30 +50,32 @@ async def lifespan(app: FastAPI):
     await tool_call_manager.start_cleanup_task()
     await cache_service.start_cleanup_task()
     
-    # Start conversation log cleanup task
+    # Start conversation log writer and cleanup tasks
     if settings.enable_conversation_logging:
         conversation_logger = get_conversation_logger()
         if conversation_logger:
+            await conversation_logger.start_writer_task()
             await conversation_logger.start_cleanup_task()
 
     yield
 
     logger.info("Shutting down Clove...")
 
-    # Save accounts
-    account_manager.save_accounts()
+    # Save accounts, after the account task so its periodic flush cannot race this one
+    await account_manager.stop_task()
+    await account_manager.flush_accounts(force=True)
 
     # Stop tasks
-    await account_manager.stop_task()
     await session_manager.cleanup_all()
     await tool_call_manager.cleanup_all()
     await cache_service.cleanup_all()
     
-    # Stop conversation log cleanup task
+    # Stop conversation log tasks and flush pending logs
     if settings.enable_conversation_logging:
         conversation_logger = get_conversation_logger()
         if conversation_logger:
             await conversation_logger.stop_cleanup_task()
+            await conversation_logger.stop_writer_task()
 
 
 app = FastAPI(
@@ -88,6 +92,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ClaudeExtraAliasMiddleware)
+app.add_middleware(AuthMiddleware)
 
 # Include routers
 app.include_router(api_router)
@@ -110,12 +116,22 @@ async def health():
 def main():
     """Main entry point for the application."""
     import uvicorn
+    from importlib.util import find_spec
+
+    # Same as `uvicorn app.main:app --loop uvloop --http httptools` when the
+    # speedups extra is installed; plain asyncio and h11 otherwise.
+    # Stay on a single worker: accounts and sessions are kept in process memory.
+    loop = "uvloop" if find_spec("uvloop") else "asyncio"
+    http = "httptools" if find_spec("httptools") else "h11"
+    logger.info(f"Starting server with {loop} event loop and {http} HTTP parser")
 
     uvicorn.run(
         "app.main:app",
         host=settings.host,
         port=settings.port,
         reload=False,
+        loop=loop,
+        http=http,
     )
 
 
@@ -1,5 +1,5 @@
 from typing import Optional, Union, Dict, Any, Literal
-from pydantic import BaseModel, RootModel, ConfigDict
+from pydantic import BaseModel, RootModel, ConfigDict, PrivateAttr
 
 from .claude import ContentBlock, Message, Usage
 
@@ -113,3 +113,8 @@ class StreamingEvent(RootModel):
         ErrorEvent,
         UnknownEvent,
     ]
+
+    # Upstream JSON payload this event was parsed from, kept only for events
+    # that are forwarded unchanged so the serializer can reuse it. Anything
+    # that edits such an event in place must reset it to None
+    _raw_data: Optional[bytes] = PrivateAttr(default=None)
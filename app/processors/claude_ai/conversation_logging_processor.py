@@ -4,6 +4,7 @@ from loguru import logger
 
 from app.processors.base import BaseProcessor
 from app.processors.claude_ai import ClaudeAIContext
+from app.services.account import current_account
 from app.services.conversation_logger import get_conversation_logger
 from app.core.config import settings
 
@@ -44,8 +45,8 @@ class ConversationLoggingProcessor(BaseProcessor):
             # 构建日志数据
             log_data = self._build_log_data(context)
 
-            # 异步记录日志
-            await conversation_logger.log_conversation(log_data)
+            # 放入写入队列，由后台任务落盘，不阻塞响应
+            conversation_logger.enqueue(log_data)
 
             logger.debug(f"Logged conversation for session: {log_data.get('session_id')}")
 
@@ -63,7 +64,7 @@ class ConversationLoggingProcessor(BaseProcessor):
             context: 处理上下文
 
         Returns:
-            日志数据字典
+            日志数据字典，其中的 pydantic 模型由日志记录器在写入时序列化
         """
         # 计算处理耗时
         start_time = context.metadata.get("start_time", time.time())
@@ -103,23 +104,25 @@ class ConversationLoggingProcessor(BaseProcessor):
             except Exception as e:
                 logger.warning(f"Failed to extract session info: {e}")
 
+        # 无 session 时（OAuth API 路径），使用本次请求中分配的账号
+        if log_data["account_id"] is None:
+            account = current_account.get()
+            if account:
+                log_data["account_id"] = account.organization_uuid
+
         # 客户端请求（脱敏处理）
         if context.messages_api_request:
             log_data["client_request"] = self._sanitize_request(
                 context.messages_api_request.model_dump(exclude_none=True)
             )
 
-        # Claude Web 请求
+        # Claude Web 请求、收集的完整消息
+        # 直接保留模型实例，由日志写入任务序列化时展开，避免在请求路径上 model_dump
         if context.claude_web_request:
-            log_data["claude_web_request"] = context.claude_web_request.model_dump(
-                exclude_none=True
-            )
+            log_data["claude_web_request"] = context.claude_web_request
 
-        # 收集的完整消息
         if context.collected_message:
-            log_data["collected_message"] = context.collected_message.model_dump(
-                exclude_none=True
-            )
+            log_data["collected_message"] = context.collected_message
 
         # 错误信息（如果有）
         if hasattr(context, "error") and context.error:
@@ -140,26 +143,40 @@ class ConversationLoggingProcessor(BaseProcessor):
         Returns:
             脱敏后的请求数据
         """
-        # 深拷贝避免修改原数据
-        import copy
-
-        sanitized = copy.deepcopy(request_data)
+        # 只复制会被修改的路径（messages -> content -> block -> source），其余数据共享引用
+        sanitized = dict(request_data)
 
-        # 处理消息中的图片数据
+        # 处理消息中的图片和文档数据
         if "messages" in sanitized:
+            messages = []
             for msg in sanitized["messages"]:
-                if isinstance(msg.get("content"), list):
-                    for block in msg["content"]:
-                        # 移除图片的 base64 数据（太大）
-                        if block.get("type") == "image":
-                            if "source" in block and "data" in block["source"]:
-                                data_len = len(block["source"]["data"])
-                                block["source"]["data"] = f"<base64_data_{data_len}_bytes>"
-
-                        # 移除文档的 base64 数据
-                        elif block.get("type") == "document":
-                            if "source" in block and "data" in block["source"]:
-                                data_len = len(block["source"]["data"])
-                                block["source"]["data"] = f"<base64_data_{data_len}_bytes>"
+                content = msg.get("content")
+                if isinstance(content, list):
+                    msg = {**msg, "content": [self._redact_block(b) for b in content]}
+                messages.append(msg)
+            sanitized["messages"] = messages
 
         return sanitized
+
+    def _redact_block(self, block: dict) -> dict:
+        """
+        移除图片/文档内容块中的 base64 数据（太大）
+
+        Args:
+            block: 消息内容块
+
+        Returns:
+            脱敏后的内容块；无需修改时返回原对象
+        """
+        if block.get("type") not in ("image", "document"):
+            return block
+
+        source = block.get("source")
+        if not isinstance(source, dict) or "data" not in source:
+            return block
+
+        data_len = len(source["data"])
+        return {
+            **block,
+            "source": {**source, "data": f"<base64_data_{data_len}_bytes>"},
+        }
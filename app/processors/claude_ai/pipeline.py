@@ -1,6 +1,7 @@
 from typing import List, Optional
 from loguru import logger
 
+from app.core.config import settings
 from app.services.session import session_manager
 from app.processors.pipeline import ProcessingPipeline
 from app.processors.base import BaseProcessor
@@ -37,8 +38,8 @@ class ClaudeAIPipeline(ProcessingPipeline):
         Args:
             processors: List of processors to use. If None, default processors are used.
         """
-        processors = (
-            [
+        if processors is None:
+            processors = [
                 TestMessageProcessor(),
                 ToolResultProcessor(),
                 ClaudeAPIProcessor(),
@@ -51,11 +52,10 @@ class ClaudeAIPipeline(ProcessingPipeline):
                 TokenCounterProcessor(),
                 StreamingResponseProcessor(),
                 NonStreamingResponseProcessor(),
-                ConversationLoggingProcessor(),
             ]
-            if processors is None
-            else processors
-        )
+            # Only install the logging processor when the feature is enabled
+            if settings.enable_conversation_logging:
+                processors.append(ConversationLoggingProcessor())
 
         super().__init__(processors)
 
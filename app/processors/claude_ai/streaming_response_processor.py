@@ -1,14 +1,77 @@
-from typing import AsyncIterator, List
+import asyncio
+from typing import (
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    List,
+    Optional,
+)
 from loguru import logger
 
 from fastapi.responses import StreamingResponse
 
+try:
+    # FastAPI >= 0.135 provides a dedicated text/event-stream response class
+    from fastapi.sse import EventSourceResponse
+except ImportError:
+
+    class EventSourceResponse(StreamingResponse):
+        """Fallback SSE response for older FastAPI versions."""
+
+        media_type = "text/event-stream"
+
 from app.processors.base import BaseProcessor
 from app.processors.claude_ai.context import ClaudeAIContext
 from app.services.event_processing.event_serializer import EventSerializer
-from app.models.streaming import StreamingEvent, ErrorEvent, ContentBlockDeltaEvent
+from app.models.streaming import StreamingEvent, ErrorEvent
 from app.core.exceptions import ClaudeStreamingError
 
+# Identical for every streaming response
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # Disable nginx buffering
+}
+
+
+class _ClaudeSSEResponse(EventSourceResponse):
+    """SSE response whose raw headers are encoded once, at import time."""
+
+    _raw_headers = [
+        (key.lower().encode("latin-1"), value.encode("latin-1"))
+        for key, value in SSE_HEADERS.items()
+    ] + [(b"content-type", b"text/event-stream; charset=utf-8")]
+
+    def init_headers(self, headers=None) -> None:
+        if headers is None:
+            # Copy: middleware (e.g. CORS) mutates the list in the response message
+            self.raw_headers = list(self._raw_headers)
+        else:
+            super().init_headers(headers)
+
+
+# Upper bounds on what is held back while waiting for the first content
+MAX_BUFFERED_EVENTS = 16
+MAX_BUFFERED_BYTES = 64 * 1024
+
+# SSE comment sent when the upstream has been silent for KEEPALIVE_INTERVAL
+# seconds, so proxies and clients don't drop a stalled but healthy connection
+KEEPALIVE_COMMENT = b": keepalive\n\n"
+KEEPALIVE_INTERVAL = 15.0
+
+# Messages arriving this close together (seconds) are sent as one chunk, up
+# to MAX_COALESCED_SIZE bytes
+COALESCE_WINDOW = 0.002
+MAX_COALESCED_SIZE = 16 * 1024
+
+
+def _skip_reason(context: ClaudeAIContext) -> str:
+    if context.response:
+        return "existing response"
+    if not context.event_stream:
+        return "missing event_stream"
+    return "non-streaming request"
+
 
 class StreamingResponseProcessor(BaseProcessor):
     """Processor that serializes event streams and creates a StreamingResponse."""
@@ -34,79 +97,89 @@ class StreamingResponseProcessor(BaseProcessor):
 
         This processor typically marks the end of the pipeline by returning STOP action.
         """
-        if context.response:
-            logger.debug("Skipping StreamingResponseProcessor due to existing response")
-            return context
-
-        if not context.event_stream:
-            logger.warning(
-                "Skipping StreamingResponseProcessor due to missing event_stream"
-            )
-            return context
-
         if (
-            not context.messages_api_request
+            context.response
+            or not context.event_stream
+            or not context.messages_api_request
             or context.messages_api_request.stream is not True
         ):
-            logger.debug(
-                "Skipping StreamingResponseProcessor due to non-streaming request"
+            # The reason is only worked out if the debug level is enabled
+            logger.opt(lazy=True).debug(
+                "Skipping StreamingResponseProcessor due to {}",
+                lambda: _skip_reason(context),
             )
             return context
 
         logger.info("Creating streaming response from event stream")
 
-        # Create a validated stream that buffers until content starts flowing
-        validated_stream = ValidatedEventStream(context.event_stream)
-        
-        # Wait for stream to be validated (first content received)
-        # This will raise ClaudeStreamingError if stream fails early
-        await validated_stream.validate()
-
-        # Now create the streaming response with the validated stream
-        sse_stream = self.serializer.serialize_stream(validated_stream)
-
-        context.response = StreamingResponse(
-            sse_stream,
-            media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "X-Accel-Buffering": "no",  # Disable nginx buffering
-            },
+        sse_stream = validated_stream(context.event_stream, self.serializer)
+
+        # Run the stream up to its first (empty) yield, which happens once
+        # validation is done. This will raise ClaudeStreamingError if stream
+        # fails early
+        await sse_stream.__anext__()
+
+        # The generator yields SSE messages directly, so no separate
+        # serialize_stream() generator sits in the hot loop
+        request = context.original_request
+        context.response = _ClaudeSSEResponse(
+            relay_stream(
+                sse_stream,
+                is_disconnected=request.is_disconnected if request else None,
+            )
         )
 
         return context
 
 
-class ValidatedEventStream:
+async def validated_stream(
+    event_stream: AsyncIterator[StreamingEvent],
+    serializer: EventSerializer,
+) -> AsyncIterator[bytes]:
     """
-    A stream wrapper that validates the stream is stable before yielding events.
-    
-    It buffers events until we see actual content (content_block_delta),
-    which indicates the model has started generating and the connection is stable.
-    
-    If an error occurs during the buffer phase, it raises an exception
-    so the caller can return a proper HTTP error (429) instead of 200+error.
+    Serialize an event stream, validating that it is stable first.
+
+    Events are buffered until we see actual content (content_block_delta),
+    which indicates the model has started generating and the connection is
+    stable. Buffered events are serialized as they arrive, while we are
+    waiting on the upstream anyway. At most MAX_BUFFERED_EVENTS events or
+    MAX_BUFFERED_BYTES of SSE output are buffered; once either cap is hit the
+    stream is treated as validated.
+
+    The first item yielded is always an empty bytes object, produced once
+    validation has finished; advance past it before handing the generator
+    to the response. If an error occurs during the buffer phase, that first
+    step raises instead, so the caller can return a proper HTTP error (429)
+    instead of 200+error.
+
+    Args:
+        event_stream: Parsed upstream events
+        serializer: Serializer producing SSE messages
+
+    Yields:
+        b"" once validated, then SSE formatted messages
+
+    Raises:
+        ClaudeStreamingError: If an error event is received before content starts
     """
+    serialize_event = serializer.serialize_event
+    buffer: List[bytes] = []
+    exhausted = False
 
-    def __init__(self, event_stream: AsyncIterator[StreamingEvent]):
-        self.event_stream = event_stream
-        self.buffer: List[StreamingEvent] = []
-        self.validated = False
-        self.exhausted = False
+    try:
+        buffered_events = 0
+        buffered_bytes = 0
+        exhausted = True
 
-    async def validate(self) -> None:
-        """
-        Buffer events until we see content flowing, then mark as validated.
-        
-        Raises:
-            ClaudeStreamingError: If an error event is received before content starts
-        """
-        async for event in self.event_stream:
-            self.buffer.append(event)
+        async for event in event_stream:
+            buffered_events += 1
+            # Route on the discriminator string rather than the model class
+            event_type = event.root.type
 
-            # Check for error events during buffer phase
-            if isinstance(event.root, ErrorEvent):
+            # Check for error events during buffer phase. An UnknownEvent can
+            # carry type "error" without an error payload, so confirm the model
+            # in this (rare) branch only
+            if event_type == "error" and isinstance(event.root, ErrorEvent):
                 error_type = event.root.error.type
                 error_message = event.root.error.message
                 logger.warning(
@@ -118,38 +191,144 @@ class ValidatedEventStream:
                     error_message=error_message,
                 )
 
+            sse_message = serialize_event(event)
+            if sse_message:
+                buffer.append(sse_message)
+                buffered_bytes += len(sse_message)
+
             # Check if we've seen actual content - stream is now stable
-            if isinstance(event.root, ContentBlockDeltaEvent):
+            if event_type == "content_block_delta":
+                logger.debug(f"Stream validated after {buffered_events} events")
+                exhausted = False
+                break
+
+            # Don't hold back an upstream that never starts content: past the
+            # cap, start flowing. Later errors reach the client as SSE error
+            # events, the same as errors after validation
+            if (
+                buffered_events >= MAX_BUFFERED_EVENTS
+                or buffered_bytes >= MAX_BUFFERED_BYTES
+            ):
                 logger.debug(
-                    f"Stream validated after {len(self.buffer)} events"
+                    f"Stream validation buffer reached {buffered_events} events "
+                    f"({buffered_bytes} bytes), streaming without content"
                 )
-                self.validated = True
-                return
+                exhausted = False
+                break
 
-        # Stream ended without content - still mark as validated
+        # If the stream ended without content it is still validated
         # (could be an empty response, let it through)
-        self.validated = True
-        self.exhausted = True
-
-    def __aiter__(self):
-        """Return self as the async iterator."""
-        return self
 
-    async def __anext__(self) -> StreamingEvent:
-        """Yield buffered events first, then continue with the stream."""
-        if not self.validated:
-            raise RuntimeError("Stream must be validated before iterating")
+        yield b""
 
-        # First, yield from buffer
-        if self.buffer:
-            return self.buffer.pop(0)
+        # First, flush the buffer (already serialized) in one chunk
+        if buffer:
+            yield b"".join(buffer)
+            buffer.clear()
 
         # If stream was exhausted during validation, we're done
-        if self.exhausted:
-            raise StopAsyncIteration
+        if exhausted:
+            return
 
         # Continue with remaining events from original stream
-        try:
-            return await self.event_stream.__anext__()
-        except StopAsyncIteration:
-            raise
+        async for event in event_stream:
+            sse_message = serialize_event(event)
+            if sse_message:
+                yield sse_message
+
+    finally:
+        # Close the upstream as soon as the client goes away (or we finish),
+        # instead of leaving it to garbage collection
+        aclose = getattr(event_stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+async def relay_stream(
+    stream: AsyncGenerator[bytes, None],
+    keepalive_interval: float = KEEPALIVE_INTERVAL,
+    coalesce_window: float = COALESCE_WINDOW,
+    max_chunk_size: int = MAX_COALESCED_SIZE,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Forward a stream to the client, batching bursts and keeping it alive.
+
+    Messages that arrive within coalesce_window of each other are joined into
+    one chunk (up to max_chunk_size), so a burst of small events costs one
+    ASGI send. While the stream is silent, keep-alive comments are inserted.
+
+    The next item is awaited in a task that survives timeouts, so neither
+    batching nor keep-alives ever cancel (and thereby break) the pending
+    upstream read. Whenever the stream has been silent for a keep-alive
+    interval, is_disconnected is polled first; on disconnect the relay stops
+    and closes the stream, which closes the upstream.
+
+    Args:
+        stream: SSE messages to forward
+        keepalive_interval: Seconds of silence before a keep-alive comment is sent
+        coalesce_window: Seconds to wait for a further message to batch
+        max_chunk_size: Size at which a batch is sent without waiting further
+        is_disconnected: Optional check for a client disconnect (e.g.
+            Request.is_disconnected)
+
+    Yields:
+        Batches of SSE messages, interleaved with keep-alive comments
+    """
+    next_item = asyncio.ensure_future(stream.__anext__())
+    try:
+        while True:
+            done, _ = await asyncio.wait((next_item,), timeout=keepalive_interval)
+            if not done:
+                if is_disconnected is not None and await is_disconnected():
+                    logger.debug("Client disconnected, closing upstream stream")
+                    return
+                yield KEEPALIVE_COMMENT
+                continue
+
+            try:
+                chunk = next_item.result()
+            except StopAsyncIteration:
+                return
+            next_item = asyncio.ensure_future(stream.__anext__())
+
+            # Collect messages that are ready right behind this one
+            parts = [chunk]
+            size = len(chunk)
+            finished = False
+            while size < max_chunk_size:
+                done, _ = await asyncio.wait((next_item,), timeout=coalesce_window)
+                if not done:
+                    break
+                try:
+                    chunk = next_item.result()
+                except StopAsyncIteration:
+                    finished = True
+                    break
+                except BaseException:
+                    # Deliver what arrived before the failure, then surface it
+                    yield parts[0] if len(parts) == 1 else b"".join(parts)
+                    raise
+                parts.append(chunk)
+                size += len(chunk)
+                next_item = asyncio.ensure_future(stream.__anext__())
+
+            yield parts[0] if len(parts) == 1 else b"".join(parts)
+
+            if finished:
+                return
+    finally:
+        if not next_item.done():
+            next_item.cancel()
+            try:
+                await next_item
+            except (asyncio.CancelledError, StopAsyncIteration):
+                pass
+        elif not next_item.cancelled():
+            # A read that failed after we stopped waiting on it (e.g. the
+            # batch hit max_chunk_size, then the client went away) must
+            # still have its exception retrieved
+            next_item.exception()
+        # A read cancelled before it started leaves the stream suspended, so
+        # close it explicitly to release the upstream
+        await stream.aclose()
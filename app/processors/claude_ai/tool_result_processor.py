@@ -103,9 +103,10 @@ class ToolResultProcessor(BaseProcessor):
 
         # Create a generator that yields the message start event followed by the resumed stream
         async def resumed_event_stream():
+            # original_stream carries text, as read from the upstream
             yield event_serializer.serialize_event(
                 StreamingEvent(root=message_start_event)
-            )
+            ).decode()
             async for event in resumed_stream:
                 yield event
 
@@ -1,18 +1,89 @@
 import asyncio
+from collections import Counter
+from contextvars import ContextVar
+import hashlib
+import heapq
 from datetime import datetime, UTC
-from typing import List, Optional, Dict, Set
+from typing import List, Optional, Dict, Set, Tuple
 
-from collections import defaultdict
 from loguru import logger
 import threading
-import json
+import os
+import random
+import time
 import uuid
 
+import orjson
+
 from app.core.config import settings
 from app.core.exceptions import NoAccountsAvailableError
-from app.core.account import Account, AccountStatus, AuthType, OAuthToken
+from app.core.account import (
+    COOKIE_AUTH,
+    MAX_CAPABILITY,
+    OAUTH_AUTH,
+    PRO_CAPABILITY,
+    Account,
+    AccountStatus,
+    AuthType,
+    OAuthToken,
+)
 from app.services.oauth import oauth_authenticator
 
+# Seconds a successful organization lookup is reused by test_account
+ORG_INFO_CACHE_TTL = 60.0
+
+# Above this many candidate accounts, sessions are assigned by sampling two
+# accounts and taking the less loaded one instead of scanning them all
+P2C_THRESHOLD = 64
+
+# Account most recently handed out in the current request's context.
+# Sessions outlive requests, so the manager's maps stay the source of truth
+# for assignment; this only spares in-request code a second lookup.
+current_account: ContextVar[Optional[Account]] = ContextVar(
+    "current_account", default=None
+)
+
+_COOKIE_CAPABLE = frozenset({AuthType.BOTH, AuthType.COOKIE_ONLY})
+_OAUTH_CAPABLE = frozenset({AuthType.OAUTH_ONLY, AuthType.BOTH})
+
+
+class _Bucket:
+    """Valid accounts sharing an auth bit and capability mask.
+
+    Members are kept in a list for sampling and in a min-heap of
+    (session count, last_used, organization_uuid) for least-loaded
+    selection. Heap entries are not updated in place: one whose key has
+    gone stale is replaced with the current key when it reaches the top,
+    and only lowering a key (releasing a session) pushes a new entry.
+    """
+
+    __slots__ = ("accounts", "positions", "heap")
+
+    def __init__(self) -> None:
+        self.accounts: List[Account] = []
+        self.positions: Dict[str, int] = {}  # organization_uuid -> index
+        self.heap: List[Tuple[int, datetime, str]] = []
+
+    def add(self, account: Account) -> None:
+        self.positions[account.organization_uuid] = len(self.accounts)
+        self.accounts.append(account)
+
+    def remove(self, organization_uuid: str) -> None:
+        position = self.positions.pop(organization_uuid)
+        last = self.accounts.pop()
+        if position < len(self.accounts):
+            self.accounts[position] = last
+            self.positions[last.organization_uuid] = position
+
+
+def cookie_key(cookie_value: str) -> bytes:
+    """Return the compact key cookie lookups are indexed by.
+
+    A 64-bit blake2b digest keeps long cookie strings out of the lookup maps;
+    Account.cookie_value remains the canonical copy.
+    """
+    return hashlib.blake2b(cookie_value.encode(), digest_size=8).digest()
+
 
 class AccountManager:
     """
@@ -21,6 +92,7 @@ class AccountManager:
     """
 
     _instance: Optional["AccountManager"] = None
+    _initialized = False
     _lock = threading.Lock()
 
     def __new__(cls):
@@ -32,16 +104,44 @@ class AccountManager:
         return cls._instance
 
     def __init__(self):
-        """Initialize the AccountManager."""
+        """Initialize the AccountManager once; later calls return the shared state."""
+        if self._initialized:
+            return
+
+        with self._lock:
+            if self._initialized:
+                return
+            self._init_state()
+            self._initialized = True
+
+    def _init_state(self) -> None:
+        """Set up the account and session maps."""
         self._accounts: Dict[str, Account] = {}  # organization_uuid -> Account
-        self._cookie_to_uuid: Dict[str, str] = {}  # cookie_value -> organization_uuid
-        self._session_accounts: Dict[str, str] = {}  # session_id -> organization_uuid
-        self._account_sessions: Dict[str, Set[str]] = defaultdict(
-            set
-        )  # organization_uuid -> set of session_ids
+        self._cookie_to_uuid: Dict[bytes, str] = {}  # cookie_key -> organization_uuid
+        self._session_accounts: Dict[str, Account] = {}  # session_id -> Account
+        # organization_uuid -> set of session_ids, only for accounts with sessions
+        self._account_sessions: Dict[str, Set[str]] = {}
+        # (auth bit, capability mask) -> valid accounts, updated lazily
+        self._buckets: Dict[Tuple[int, int], _Bucket] = {}
+        # organization_uuid -> (status, auth mask, capability mask) indexed under
+        self._indexed: Dict[str, Tuple[AccountStatus, int, int]] = {}
+        self._status_counts: Counter[AccountStatus] = Counter()
+        self._buckets_valid = False
+        # organization_uuid -> position in sorted uuid order, rebuilt lazily
+        self._proxy_index: Optional[Dict[str, int]] = None
+        # Min-heaps of (resets_at, uuid) and (expires_at, uuid), updated lazily
+        self._rate_limit_heap: List[Tuple[datetime, str]] = []
+        self._refresh_heap: List[Tuple[float, str]] = []
+        self._timers_valid = False
+        # Set by save_accounts, written out by the background task
+        self._dirty = False
+        # cookie_key -> (expires_at monotonic, (organization_uuid, capabilities))
+        self._org_info_cache: Dict[bytes, Tuple[float, Tuple[str, List[str]]]] = {}
         self._account_task: Optional[asyncio.Task] = None
         self._max_sessions_per_account = settings.max_sessions_per_cookie
         self._account_task_interval = settings.account_task_interval
+        self._refresh_semaphore = asyncio.Semaphore(settings.max_concurrent_refreshes)
+        self._refreshing: Set[str] = set()  # organization_uuids being refreshed
 
         logger.info("AccountManager initialized")
 
@@ -66,8 +166,10 @@ class AccountManager:
         if not cookie_value and not oauth_token:
             raise ValueError("Either cookie_value or oauth_token must be provided")
 
-        if cookie_value and cookie_value in self._cookie_to_uuid:
-            return self._accounts[self._cookie_to_uuid[cookie_value]]
+        if cookie_value:
+            known_uuid = self._cookie_to_uuid.get(cookie_key(cookie_value))
+            if known_uuid:
+                return self._accounts[known_uuid]
 
         if cookie_value and (not organization_uuid or not capabilities):
             (
@@ -82,9 +184,11 @@ class AccountManager:
 
             if cookie_value and existing_account.cookie_value != cookie_value:
                 if existing_account.cookie_value:
-                    del self._cookie_to_uuid[existing_account.cookie_value]
+                    self._cookie_to_uuid.pop(
+                        cookie_key(existing_account.cookie_value), None
+                    )
                 existing_account.cookie_value = cookie_value
-                self._cookie_to_uuid[cookie_value] = organization_uuid
+                self._cookie_to_uuid[cookie_key(cookie_value)] = organization_uuid
             return existing_account
 
         if not organization_uuid:
@@ -107,10 +211,11 @@ class AccountManager:
             auth_type=auth_type,
         )
         self._accounts[organization_uuid] = account
+        self._invalidate_indexes()
         self.save_accounts()
 
         if cookie_value:
-            self._cookie_to_uuid[cookie_value] = organization_uuid
+            self._cookie_to_uuid[cookie_key(cookie_value)] = organization_uuid
 
         logger.info(
             f"Added new account: {organization_uuid[:8]}... "
@@ -136,10 +241,13 @@ class AccountManager:
                 if session_id in self._session_accounts:
                     del self._session_accounts[session_id]
 
-            if account.cookie_value and account.cookie_value in self._cookie_to_uuid:
-                del self._cookie_to_uuid[account.cookie_value]
+            if account.cookie_value:
+                key = cookie_key(account.cookie_value)
+                self._cookie_to_uuid.pop(key, None)
+                self._org_info_cache.pop(key, None)
 
             del self._accounts[organization_uuid]
+            self._invalidate_indexes()
 
             if organization_uuid in self._account_sessions:
                 del self._account_sessions[organization_uuid]
@@ -147,6 +255,118 @@ class AccountManager:
             logger.info(f"Removed account: {organization_uuid[:8]}...")
             self.save_accounts()
 
+    def _invalidate_indexes(self) -> None:
+        """Drop derived indexes after accounts are added or removed."""
+        self._buckets_valid = False
+        self._proxy_index = None
+        self._timers_valid = False
+
+    def _drain_changes(self, changes: Set[Account]) -> List[Account]:
+        """Empty one of Account's change sets, keeping accounts still managed."""
+        accounts = [
+            account
+            for account in changes
+            if self._accounts.get(account.organization_uuid) is account
+        ]
+        changes.clear()
+        return accounts
+
+    def _sync_buckets(self) -> None:
+        """Bring the selection buckets and status counts up to date.
+
+        Status, auth_type and capabilities are also written outside this
+        class (request handling, OAuth refresh, admin routes). Account records
+        those writes in Account.index_changes, so only the written accounts
+        are moved between buckets; adding or removing accounts rebuilds all.
+        """
+        if not self._buckets_valid:
+            Account.index_changes.clear()
+            self._buckets = {}
+            self._indexed = {}
+            self._status_counts = Counter()
+            for account in self._accounts.values():
+                self._index_account(account)
+            self._buckets_valid = True
+        elif Account.index_changes:
+            for account in self._drain_changes(Account.index_changes):
+                self._index_account(account)
+
+    def _index_account(self, account: Account) -> None:
+        """Move an account to the buckets matching its current fields."""
+        organization_uuid = account.organization_uuid
+        key = (account.status, account.auth_mask, account.capability_mask)
+        previous = self._indexed.get(organization_uuid)
+        if previous == key:
+            return
+
+        if previous is not None:
+            status, auth_mask, capability_mask = previous
+            self._status_counts[status] -= 1
+            if status is AccountStatus.VALID:
+                for bit in (COOKIE_AUTH, OAUTH_AUTH):
+                    if auth_mask & bit:
+                        bucket = self._buckets[(bit, capability_mask)]
+                        bucket.remove(organization_uuid)
+                        if not bucket.accounts:
+                            del self._buckets[(bit, capability_mask)]
+
+        self._indexed[organization_uuid] = key
+        status, auth_mask, capability_mask = key
+        self._status_counts[status] += 1
+        if status is AccountStatus.VALID:
+            for bit in (COOKIE_AUTH, OAUTH_AUTH):
+                if auth_mask & bit:
+                    bucket = self._buckets.get((bit, capability_mask))
+                    if bucket is None:
+                        bucket = self._buckets[(bit, capability_mask)] = _Bucket()
+                    bucket.add(account)
+                    self._push_load(bucket, account)
+
+    def _session_count(self, organization_uuid: str) -> int:
+        """Number of sessions currently assigned to an account."""
+        return len(self._account_sessions.get(organization_uuid, ()))
+
+    def _push_load(self, bucket: _Bucket, account: Account) -> None:
+        """Push an account's current load onto its bucket's heap."""
+        heap = bucket.heap
+        if len(heap) > 2 * len(bucket.accounts) + 16:
+            # Too many superseded entries; rebuild from the members
+            heap[:] = [
+                (
+                    self._session_count(member.organization_uuid),
+                    member.last_used,
+                    member.organization_uuid,
+                )
+                for member in bucket.accounts
+            ]
+            heapq.heapify(heap)
+            return
+        heapq.heappush(
+            heap,
+            (
+                self._session_count(account.organization_uuid),
+                account.last_used,
+                account.organization_uuid,
+            ),
+        )
+
+    def _candidates(
+        self, auth_bit: int, is_pro: Optional[bool], is_max: Optional[bool]
+    ) -> List[_Bucket]:
+        """Return the buckets of valid accounts matching the filters."""
+        self._sync_buckets()
+
+        # Bits the caller filters on, and the values it wants for them
+        care = (PRO_CAPABILITY if is_pro is not None else 0) | (
+            MAX_CAPABILITY if is_max is not None else 0
+        )
+        want = (PRO_CAPABILITY if is_pro else 0) | (MAX_CAPABILITY if is_max else 0)
+        return [
+            bucket
+            for (bucket_auth, capability_mask), bucket in self._buckets.items()
+            if bucket_auth == auth_bit and (capability_mask ^ want) & care == 0
+        ]
+
     async def get_account_for_session(
         self,
         session_id: str,
@@ -164,64 +384,114 @@ class AccountManager:
         Returns:
             Account instance if available
         """
-        # Convert single auth_type to list for uniform handling
-        if session_id in self._session_accounts:
-            organization_uuid = self._session_accounts[session_id]
-            if organization_uuid in self._accounts:
-                account = self._accounts[organization_uuid]
-                if account.status == AccountStatus.VALID:
-                    return account
-                else:
-                    del self._session_accounts[session_id]
-                    self._account_sessions[organization_uuid].discard(session_id)
+        # remove_account drops the sessions of removed accounts, so a hit is managed
+        account = self._session_accounts.get(session_id)
+        if account is not None:
+            if account.status is AccountStatus.VALID:
+                current_account.set(account)
+                return account
+            del self._session_accounts[session_id]
+            self._detach_session(account.organization_uuid, session_id)
 
+        self._recover_inline()
+        buckets = self._candidates(COOKIE_AUTH, is_pro, is_max)
         best_account = None
-        min_sessions = float("inf")
-        earliest_last_used = None
+        if sum(len(bucket.accounts) for bucket in buckets) > P2C_THRESHOLD:
+            best_account = self._power_of_two_choices(buckets)
+        if best_account is None:
+            best_account = self._least_loaded(buckets)
 
-        for organization_uuid, account in self._accounts.items():
-            if account.status != AccountStatus.VALID:
-                continue
+        if best_account:
+            self._session_accounts[session_id] = best_account
+            sessions = self._account_sessions.setdefault(
+                best_account.organization_uuid, set()
+            )
+            sessions.add(session_id)
 
-            # Filter by auth type if specified
-            if account.auth_type not in [AuthType.BOTH, AuthType.COOKIE_ONLY]:
-                continue
+            logger.debug(
+                f"Assigned account to session {session_id}, "
+                f"account now has {len(sessions)} sessions"
+            )
 
-            # Filter by capabilities if specified
-            if is_pro is not None and account.is_pro != is_pro:
-                continue
-            if is_max is not None and account.is_max != is_max:
-                continue
+            current_account.set(best_account)
+            return best_account
 
-            session_count = len(self._account_sessions[organization_uuid])
-            if session_count >= self._max_sessions_per_account:
+        raise NoAccountsAvailableError()
+
+    def _least_loaded(self, buckets: List[_Bucket]) -> Optional[Account]:
+        """Return the candidate with the fewest sessions, earliest last_used first."""
+        best_entry = None
+        for bucket in buckets:
+            entry = self._settle_top(bucket)
+            if entry is not None and (best_entry is None or entry < best_entry):
+                best_entry = entry
+                best_bucket = bucket
+
+        if best_entry is None:
+            return None
+        return best_bucket.accounts[best_bucket.positions[best_entry[2]]]
+
+    def _settle_top(self, bucket: _Bucket) -> Optional[Tuple[int, datetime, str]]:
+        """Fix up a bucket's heap until its top entry is current.
+
+        Entries of accounts that left the bucket are dropped, and so are
+        those of full accounts: releasing a session pushes them back.
+
+        Returns:
+            The top entry, or None if no member has room for a session
+        """
+        heap = bucket.heap
+        while heap:
+            session_count, last_used, organization_uuid = heap[0]
+            position = bucket.positions.get(organization_uuid)
+            if position is None:
+                heapq.heappop(heap)
                 continue
 
-            # Select account with least sessions
-            # If multiple accounts have the same least sessions, select the one with earliest last_used
-            if session_count < min_sessions or (
-                session_count == min_sessions
-                and (
-                    earliest_last_used is not None
-                    and account.last_used < earliest_last_used
+            account = bucket.accounts[position]
+            current_count = self._session_count(organization_uuid)
+            if current_count >= self._max_sessions_per_account:
+                heapq.heappop(heap)
+            elif current_count == session_count and account.last_used == last_used:
+                return heap[0]
+            else:
+                heapq.heapreplace(
+                    heap, (current_count, account.last_used, organization_uuid)
                 )
-            ):
-                min_sessions = session_count
-                earliest_last_used = account.last_used
-                best_account = account
+        return None
 
-        if best_account:
-            self._session_accounts[session_id] = best_account.organization_uuid
-            self._account_sessions[best_account.organization_uuid].add(session_id)
+    def _power_of_two_choices(
+        self, buckets: List[List[Account]]
+    ) -> Optional[Account]:
+        """Sample two candidates and return the less loaded one.
 
-            logger.debug(
-                f"Assigned account to session {session_id}, "
-                f"account now has {len(self._account_sessions[best_account.organization_uuid])} sessions"
-            )
+        Returns None if both sampled accounts are full, so the caller can
+        fall back to a full scan.
+        """
+        total = sum(len(bucket.accounts) for bucket in buckets)
+        sampled = []
+        for index in random.sample(range(total), 2):
+            for bucket in buckets:
+                if index < len(bucket.accounts):
+                    sampled.append(bucket.accounts[index])
+                    break
+                index -= len(bucket.accounts)
 
-            return best_account
+        best_account = None
+        best_key = None
+        for account in sampled:
+            session_count = len(
+                self._account_sessions.get(account.organization_uuid, ())
+            )
+            if session_count >= self._max_sessions_per_account:
+                continue
+            # Ties between the two samples go to the earliest last_used
+            key = (session_count, account.last_used)
+            if best_key is None or key < best_key:
+                best_key = key
+                best_account = account
 
-        raise NoAccountsAvailableError()
+        return best_account
 
     async def get_account_for_oauth(
         self,
@@ -238,31 +508,22 @@ class AccountManager:
         Returns:
             Account instance if available
         """
+        self._recover_inline()
         earliest_account = None
         earliest_last_used = None
 
-        for account in self._accounts.values():
-            if account.status != AccountStatus.VALID:
-                continue
-
-            if account.auth_type not in [AuthType.OAUTH_ONLY, AuthType.BOTH]:
-                continue
-
-            # Filter by capabilities if specified
-            if is_pro is not None and account.is_pro != is_pro:
-                continue
-            if is_max is not None and account.is_max != is_max:
-                continue
-
-            if earliest_last_used is None or account.last_used < earliest_last_used:
-                earliest_last_used = account.last_used
-                earliest_account = account
+        for bucket in self._candidates(OAUTH_AUTH, is_pro, is_max):
+            for account in bucket.accounts:
+                if earliest_last_used is None or account.last_used < earliest_last_used:
+                    earliest_last_used = account.last_used
+                    earliest_account = account
 
         if earliest_account:
             logger.debug(
                 f"Selected OAuth account: {earliest_account.organization_uuid[:8]}... "
-                f"(last used: {earliest_account.last_used.isoformat()})"
+                f"(last used: {earliest_account.last_used_iso})"
             )
+            current_account.set(earliest_account)
             return earliest_account
 
         raise NoAccountsAvailableError()
@@ -281,6 +542,7 @@ class AccountManager:
         
         if account and account.status == AccountStatus.VALID:
             logger.debug(f"Retrieved account by ID: {account_id[:8]}...")
+            current_account.set(account)
             return account
         
         if account:
@@ -292,6 +554,21 @@ class AccountManager:
         
         return None
 
+    async def _get_organization_info(self, cookie_value: str) -> Tuple[str, List[str]]:
+        """Fetch organization info for a cookie, reusing recent successful lookups."""
+        key = cookie_key(cookie_value)
+        now = time.monotonic()
+        cached = self._org_info_cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        org_info = await oauth_authenticator.get_organization_info(cookie_value)
+        if org_info[0]:
+            self._org_info_cache[key] = (now + ORG_INFO_CACHE_TTL, org_info)
+        else:
+            self._org_info_cache.pop(key, None)
+        return org_info
+
     async def test_account(self, organization_uuid: str) -> Dict:
         """
         Test an account to check if its credentials are still valid.
@@ -319,9 +596,9 @@ class AccountManager:
         logger.info(f"Testing account: {organization_uuid[:8]}... (auth_type: {account.auth_type.value})")
 
         # Test cookie authentication if available
-        if account.auth_type in [AuthType.COOKIE_ONLY, AuthType.BOTH] and account.cookie_value:
+        if account.auth_type in _COOKIE_CAPABLE and account.cookie_value:
             try:
-                org_uuid, capabilities = await oauth_authenticator.get_organization_info(
+                org_uuid, capabilities = await self._get_organization_info(
                     account.cookie_value
                 )
                 
@@ -345,9 +622,9 @@ class AccountManager:
                 logger.error(f"Cookie authentication test error for account {organization_uuid[:8]}...: {e}")
 
         # Test OAuth authentication if available
-        if account.auth_type in [AuthType.OAUTH_ONLY, AuthType.BOTH] and account.oauth_token:
+        if account.auth_type in _OAUTH_CAPABLE and account.oauth_token:
             try:
-                current_timestamp = datetime.now(UTC).timestamp()
+                current_timestamp = time.time()
                 
                 # Check if token is expired or about to expire
                 if account.oauth_token.expires_at - current_timestamp < 300:
@@ -431,10 +708,13 @@ class AccountManager:
             return settings.proxy_url  # Fallback to global proxy
 
         # Get account index (stable ordering by organization_uuid)
-        account_list = sorted(self._accounts.keys())
-        try:
-            account_index = account_list.index(organization_uuid)
-        except ValueError:
+        if self._proxy_index is None:
+            self._proxy_index = {
+                account_uuid: index
+                for index, account_uuid in enumerate(sorted(self._accounts))
+            }
+        account_index = self._proxy_index.get(organization_uuid)
+        if account_index is None:
             logger.warning(
                 f"Account {organization_uuid[:8]}... not found in account list, "
                 "falling back to global proxy"
@@ -459,15 +739,29 @@ class AccountManager:
 
     async def release_session(self, session_id: str) -> None:
         """Release a session's account assignment."""
-        if session_id in self._session_accounts:
-            organization_uuid = self._session_accounts[session_id]
-            del self._session_accounts[session_id]
-
-            if organization_uuid in self._account_sessions:
-                self._account_sessions[organization_uuid].discard(session_id)
+        account = self._session_accounts.pop(session_id, None)
+        if account is not None:
+            self._detach_session(account.organization_uuid, session_id)
 
             logger.debug(f"Released account for session {session_id}")
 
+    def _detach_session(self, organization_uuid: str, session_id: str) -> None:
+        """Remove a session from an account's set, dropping the set once empty."""
+        sessions = self._account_sessions.get(organization_uuid)
+        if sessions is not None:
+            sessions.discard(session_id)
+            if not sessions:
+                del self._account_sessions[organization_uuid]
+
+            # The account's load went down, which its heap entries can't see
+            indexed = self._buckets_valid and self._indexed.get(organization_uuid)
+            if indexed and indexed[0] is AccountStatus.VALID:
+                bucket = self._buckets.get((COOKIE_AUTH, indexed[2]))
+                if bucket is not None and organization_uuid in bucket.positions:
+                    self._push_load(
+                        bucket, bucket.accounts[bucket.positions[organization_uuid]]
+                    )
+
     async def start_task(self) -> None:
         """Start the background task for AccountManager."""
         if self._account_task is None or self._account_task.done():
@@ -486,8 +780,11 @@ class AccountManager:
         """Background loop for AccountManager."""
         while True:
             try:
-                await self._check_and_recover_accounts()
-                await self._check_and_refresh_accounts()
+                # One clock read per tick, shared by both passes
+                current_time = datetime.now(UTC)
+                await self._check_and_recover_accounts(current_time)
+                await self._check_and_refresh_accounts(current_time.timestamp())
+                await self.flush_accounts()
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -495,16 +792,96 @@ class AccountManager:
             finally:
                 await asyncio.sleep(self._account_task_interval)
 
-    async def _check_and_recover_accounts(self) -> None:
-        """Check and recover rate-limited accounts."""
-        current_time = datetime.now(UTC)
+    def _sync_timers(self) -> None:
+        """Bring the recovery and refresh heaps up to date.
+
+        Like the selection buckets, resets_at and oauth_token are set outside
+        this class. Accounts recorded in Account.reset_changes and
+        Account.refresh_changes get a new heap entry, and the entries they
+        supersede are skipped when popped; adding or removing accounts, or
+        too many superseded entries, rebuilds the heaps from scratch.
+        """
+        if self._timers_valid:
+            for account in self._drain_changes(Account.reset_changes):
+                entry = self._rate_limit_entry(account)
+                if entry is not None:
+                    heapq.heappush(self._rate_limit_heap, entry)
+            for account in self._drain_changes(Account.refresh_changes):
+                entry = self._refresh_entry(account)
+                if entry is not None:
+                    heapq.heappush(self._refresh_heap, entry)
+
+            limit = 2 * len(self._accounts) + 16
+            if max(len(self._rate_limit_heap), len(self._refresh_heap)) <= limit:
+                return
+
+        Account.reset_changes.clear()
+        Account.refresh_changes.clear()
+        self._rate_limit_heap = [
+            entry
+            for entry in map(self._rate_limit_entry, self._accounts.values())
+            if entry is not None
+        ]
+        heapq.heapify(self._rate_limit_heap)
+        self._refresh_heap = [
+            entry
+            for entry in map(self._refresh_entry, self._accounts.values())
+            if entry is not None
+        ]
+        heapq.heapify(self._refresh_heap)
+        self._timers_valid = True
+
+    @staticmethod
+    def _rate_limit_entry(account: Account) -> Optional[Tuple[datetime, str]]:
+        """Recovery heap entry for an account, or None if it isn't rate limited."""
+        if account.status == AccountStatus.RATE_LIMITED and account.resets_at:
+            return (account.resets_at, account.organization_uuid)
+        return None
+
+    @staticmethod
+    def _refresh_entry(account: Account) -> Optional[Tuple[float, str]]:
+        """Refresh heap entry for an account, or None if it has nothing to refresh."""
+        if (
+            account.auth_mask & OAUTH_AUTH
+            and account.oauth_token
+            and account.oauth_token.refresh_token
+            and account.oauth_token.expires_at
+        ):
+            return (account.oauth_token.expires_at, account.organization_uuid)
+        return None
+
+    async def _check_and_recover_accounts(self, current_time: datetime) -> None:
+        """Check and recover rate-limited accounts.
 
-        for account in self._accounts.values():
-            # Check rate-limited accounts
+        Args:
+            current_time: Aware UTC time of the current tick
+        """
+        self._sync_timers()
+        self._recover_due_accounts(current_time)
+
+    def _recover_inline(self) -> None:
+        """Recover accounts whose rate limit ended since the last tick.
+
+        Called on selection. It only peeks at the heap as of the last tick;
+        an account limited after that tick is picked up by the tick loop.
+        """
+        heap = self._rate_limit_heap
+        if heap:
+            current_time = datetime.now(UTC)
+            if heap[0][0] <= current_time:
+                self._recover_due_accounts(current_time)
+
+    def _recover_due_accounts(self, current_time: datetime) -> None:
+        """Pop due rate-limit heap entries and mark their accounts valid."""
+        heap = self._rate_limit_heap
+        while heap and heap[0][0] <= current_time:
+            resets_at, organization_uuid = heapq.heappop(heap)
+            account = self._accounts.get(organization_uuid)
+            # Skip entries made stale since the heap was built
             if (
-                account.status == AccountStatus.RATE_LIMITED
-                and account.resets_at
-                and current_time >= account.resets_at
+                account
+                and account.status == AccountStatus.RATE_LIMITED
+                and account.resets_at == resets_at
             ):
                 account.status = AccountStatus.VALID
                 account.resets_at = None
@@ -512,27 +889,56 @@ class AccountManager:
                     f"Recovered rate-limited account: {account.organization_uuid[:8]}..."
                 )
 
-    async def _check_and_refresh_accounts(self) -> None:
-        """Check and refresh expired/expiring tokens."""
-        current_timestamp = datetime.now(UTC).timestamp()
+    async def _check_and_refresh_accounts(self, current_timestamp: float) -> None:
+        """Check and refresh expired/expiring tokens.
+
+        Args:
+            current_timestamp: Unix timestamp of the current tick
+        """
 
-        for account in self._accounts.values():
+        self._sync_timers()
+        heap = self._refresh_heap
+        expiring: Dict[str, Account] = {}
+        while heap and heap[0][0] - current_timestamp < 300:
+            expires_at, organization_uuid = heapq.heappop(heap)
+            account = self._accounts.get(organization_uuid)
             if (
-                account.auth_type in [AuthType.OAUTH_ONLY, AuthType.BOTH]
+                account
                 and account.oauth_token
-                and account.oauth_token.refresh_token
-                and account.oauth_token.expires_at
+                and account.oauth_token.expires_at == expires_at
+                and organization_uuid not in self._refreshing
             ):
-                if account.oauth_token.expires_at - current_timestamp < 300:
-                    asyncio.create_task(self._refresh_account_token(account))
+                # An account can have several entries for the same token
+                expiring[organization_uuid] = account
+
+        if expiring:
+            # Bounded by _refresh_semaphore inside _refresh_account_token
+            await asyncio.gather(
+                *(
+                    self._refresh_account_token(account)
+                    for account in expiring.values()
+                ),
+                return_exceptions=True,
+            )
 
     async def _refresh_account_token(self, account: Account) -> None:
         """Refresh OAuth token for an account."""
-        logger.info(
-            f"Refreshing OAuth token for account: {account.organization_uuid[:8]}..."
-        )
+        organization_uuid = account.organization_uuid
+        if organization_uuid in self._refreshing:
+            return
+
+        self._refreshing.add(organization_uuid)
+        try:
+            async with self._refresh_semaphore:
+                logger.info(
+                    f"Refreshing OAuth token for account: {organization_uuid[:8]}..."
+                )
+                success = await oauth_authenticator.refresh_account_token(account)
+        finally:
+            self._refreshing.discard(organization_uuid)
+            # Re-queue the account on the next tick even if no field changed
+            Account.refresh_changes.add(account)
 
-        success = await oauth_authenticator.refresh_account_token(account)
         if success:
             logger.info(
                 f"Successfully refreshed OAuth token for account: {account.organization_uuid[:8]}..."
@@ -570,19 +976,12 @@ class AccountManager:
 
     async def get_status(self) -> Dict:
         """Get the current status of all accounts."""
+        self._sync_buckets()
         status = {
             "total_accounts": len(self._accounts),
-            "valid_accounts": sum(
-                1 for a in self._accounts.values() if a.status == AccountStatus.VALID
-            ),
-            "rate_limited_accounts": sum(
-                1
-                for a in self._accounts.values()
-                if a.status == AccountStatus.RATE_LIMITED
-            ),
-            "invalid_accounts": sum(
-                1 for a in self._accounts.values() if a.status == AccountStatus.INVALID
-            ),
+            "valid_accounts": self._status_counts[AccountStatus.VALID],
+            "rate_limited_accounts": self._status_counts[AccountStatus.RATE_LIMITED],
+            "invalid_accounts": self._status_counts[AccountStatus.INVALID],
             "active_sessions": len(self._session_accounts),
             "accounts": [],
         }
@@ -595,11 +994,9 @@ class AccountManager:
                 else "None",
                 "status": account.status.value,
                 "auth_type": account.auth_type.value,
-                "sessions": len(self._account_sessions[organization_uuid]),
-                "last_used": account.last_used.isoformat(),
-                "resets_at": account.resets_at.isoformat()
-                if account.resets_at
-                else None,
+                "sessions": len(self._account_sessions.get(organization_uuid, ())),
+                "last_used": account.last_used_iso,
+                "resets_at": account.resets_at_iso,
                 "has_oauth": account.oauth_token is not None,
             }
             status["accounts"].append(account_info)
@@ -607,26 +1004,52 @@ class AccountManager:
         return status
 
     def save_accounts(self) -> None:
-        """Save all accounts to JSON file.
+        """Mark accounts as changed so the next background tick writes them.
+
+        Bursts of changes within one account_task_interval are collapsed into
+        a single write; use flush_accounts() to write immediately.
+        """
+        self._dirty = True
+
+    async def flush_accounts(self, force: bool = False) -> None:
+        """Write accounts to the JSON file if they changed since the last write.
 
         Args:
-            data_folder: Optional data folder path. If not provided, uses settings.data_folder
+            force: Write even if save_accounts() was not called, e.g. on
+                shutdown to persist last_used timestamps
         """
+        if not (self._dirty or force):
+            return
+
         if settings.no_filesystem_mode:
             logger.debug("No-filesystem mode enabled, skipping account save to disk")
+            self._dirty = False
             return
 
-        settings.data_folder.mkdir(parents=True, exist_ok=True)
-
-        accounts_file = settings.data_folder / "accounts.json"
-
+        # Snapshot every account with to_dict() on the event loop, so the
+        # worker thread never reads a live Account that is mid-update (e.g.
+        # auth_type changed but oauth_token not yet cleared). Only encoding
+        # and the write run in the thread. A change made meanwhile calls
+        # save_accounts() again, so it is picked up by the next flush.
+        self._dirty = False
         accounts_data = {
             organization_uuid: account.to_dict()
             for organization_uuid, account in self._accounts.items()
         }
 
-        with open(accounts_file, "w", encoding="utf-8") as f:
-            json.dump(accounts_data, f, indent=2)
+        try:
+            await asyncio.to_thread(self._write_accounts_file, accounts_data)
+        except Exception:
+            self._dirty = True
+            raise
+
+    def _write_accounts_file(self, accounts_data: Dict[str, dict]) -> None:
+        """Encode an accounts snapshot and atomically replace accounts.json."""
+        accounts_file = settings.ensure_data_folder() / "accounts.json"
+        tmp_file = accounts_file.with_suffix(".json.tmp")
+
+        tmp_file.write_bytes(orjson.dumps(accounts_data, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_file, accounts_file)
 
         logger.info(f"Saved {len(accounts_data)} accounts to {accounts_file}")
 
@@ -647,8 +1070,8 @@ class AccountManager:
             return
 
         try:
-            with open(accounts_file, "r", encoding="utf-8") as f:
-                accounts_data = json.load(f)
+            accounts_data = orjson.loads(accounts_file.read_bytes())
+            self._invalidate_indexes()
 
             for organization_uuid, account_data in accounts_data.items():
                 account = Account.from_dict(account_data)
@@ -656,7 +1079,9 @@ class AccountManager:
 
                 # Rebuild cookie mapping
                 if account.cookie_value:
-                    self._cookie_to_uuid[account.cookie_value] = organization_uuid
+                    self._cookie_to_uuid[cookie_key(account.cookie_value)] = (
+                        organization_uuid
+                    )
 
             logger.info(f"Loaded {len(accounts_data)} accounts from {accounts_file}")
 
@@ -1,29 +1,665 @@
-import json
+import io
+import os
 import uuid
+import heapq
+import struct
+import time
 import asyncio
-import aiofiles
+import orjson
+from bisect import bisect_right
+from itertools import islice
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from datetime import date as date_type, datetime, timedelta
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Any,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 from loguru import logger
+from pydantic import BaseModel
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+def _pydantic_default(obj: Any) -> Any:
+    """orjson 的 default 回调：在写入时再展开日志中保留的 pydantic 模型"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(exclude_none=True, mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+# 日志索引文件 (YYYY-MM-DD.idx) 格式：
+# 文件头为索引开始覆盖时 JSONL 文件的大小，此前写入的记录不在索引中；
+# 之后每条记录一项：log_id 的 16 字节 UUID、记录在 JSONL 中的偏移和长度
+_INDEX_HEADER = struct.Struct("<Q")
+_INDEX_ENTRY = struct.Struct("<16sQI")
+
+# 压缩后的日志由多个可独立解压的 zstd 帧组成，索引文件末尾追加帧表：
+# 每帧一项（解压后的起始偏移、压缩文件中的起始偏移），末项为文件结尾；
+# 最后是帧表项数和标识
+_FRAME_ENTRY = struct.Struct("<QQ")
+_FRAME_FOOTER = struct.Struct("<I8s")
+_FRAME_MAGIC = b"CLVFRAME"
+
+# 压缩时每帧大约包含的未压缩字节数，帧在行边界切分
+_COMPRESS_FRAME_SIZE = 256 * 1024
+
+
+# 清理时识别的日志文件、压缩后的日志文件及索引文件
+_LOG_FILE_SUFFIXES = (".jsonl", ".zst", ".idx")
+
+# 过去日期的日志文件压缩后的后缀 (YYYY-MM-DD.jsonl.zst)
+_COMPRESSED_SUFFIX = ".zst"
+
+# 按块读取日志文件的大小，每次读取在内存中切分出多行
+_READ_CHUNK_SIZE = 1 << 20
+
+
+# 批量读取的随机字节数，每个 log_id 消耗 10 字节
+_RANDOM_POOL_SIZE = 4096
+
+_UNIX_EPOCH = datetime(1970, 1, 1)
+
+
+def _uuid7(timestamp_ns: int, random_bytes: bytes) -> uuid.UUID:
+    """
+    生成 UUIDv7：高 48 位为 Unix 毫秒时间戳，其余为 10 字节随机数
+
+    Python 3.11 的标准库还没有 uuid.uuid7，这里按 RFC 9562 的布局手动拼装。
+    """
+    value = (timestamp_ns // 1_000_000) << 80 | int.from_bytes(random_bytes)
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # 版本号
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 变体
+    return uuid.UUID(int=value)
+
+
+def _uuid7_datetime(log_id: str) -> Optional[datetime]:
+    """从 UUIDv7 格式的 log_id 中取出生成时间（本地时间），其他格式返回 None"""
+    try:
+        value = uuid.UUID(log_id)
+    except ValueError:
+        return None
+    if value.version != 7:
+        return None
+    return datetime.fromtimestamp((value.int >> 80) / 1000)
+
+
+def _log_timestamp(log: Dict[str, Any]) -> str:
+    """日志记录的排序键"""
+    return log.get("timestamp", "")
+
+
+def _index_path(log_file: Path) -> Path:
+    """获取日志文件（含压缩后的文件）对应的索引文件路径"""
+    return log_file.with_name(f"{log_file.name.split('.', 1)[0]}.idx")
+
+
+def _compressed_path(log_file: Path) -> Path:
+    """获取日志文件压缩后的路径"""
+    return log_file.with_name(log_file.name + _COMPRESSED_SUFFIX)
+
+
+def _parse_log_date(name: str) -> Optional[datetime]:
+    """从 YYYY-MM-DD.* 格式的文件名按位置解析日期，格式不符时返回 None"""
+    try:
+        if name[4] != "-" or name[7] != "-" or name[10] != ".":
+            return None
+        return datetime(int(name[0:4]), int(name[5:7]), int(name[8:10]))
+    except (IndexError, ValueError):
+        return None
+
+
+def _split_frame_table(index: bytes) -> Tuple[int, Optional[List[Tuple[int, int]]]]:
+    """
+    拆出索引内容末尾的帧表
+
+    Returns:
+        (索引条目区的结束位置, 帧表)，没有帧表时帧表为 None
+    """
+    end = len(index) - _FRAME_FOOTER.size
+    if end < _INDEX_HEADER.size:
+        return len(index), None
+    count, magic = _FRAME_FOOTER.unpack_from(index, end)
+    start = end - count * _FRAME_ENTRY.size
+    if magic != _FRAME_MAGIC or count < 1 or start < _INDEX_HEADER.size:
+        return len(index), None
+    return start, list(_FRAME_ENTRY.iter_unpack(index[start:end]))
+
+
+def _read_frame_table(index_file: Path) -> Optional[List[Tuple[int, int]]]:
+    """只读取索引文件末尾的帧表，没有帧表时返回 None"""
+    try:
+        with open(index_file, "rb") as f:
+            size = f.seek(0, 2)
+            if size < _INDEX_HEADER.size + _FRAME_FOOTER.size:
+                return None
+            f.seek(size - _FRAME_FOOTER.size)
+            count, magic = _FRAME_FOOTER.unpack(f.read(_FRAME_FOOTER.size))
+            start = size - _FRAME_FOOTER.size - count * _FRAME_ENTRY.size
+            if magic != _FRAME_MAGIC or count < 1 or start < _INDEX_HEADER.size:
+                return None
+            f.seek(start)
+            return list(
+                _FRAME_ENTRY.iter_unpack(f.read(count * _FRAME_ENTRY.size))
+            )
+    except FileNotFoundError:
+        return None
+
+
+class _ZstdFrameReader(io.RawIOBase):
+    """
+    按帧随机读取压缩后的日志文件
+
+    seek 只移动读取位置，读取时才解压所在的帧，并缓存最近解压的一帧；
+    按索引定位时只需解压一帧，倒序扫描时从文件末尾逐帧向前解压。
+    """
+
+    def __init__(self, path: Path, frames: List[Tuple[int, int]]):
+        super().__init__()
+        self._file = open(path, "rb")
+        self._frames = frames
+        self._starts = [start for start, _ in frames]
+        self._size = frames[-1][0]
+        self._position = 0
+        self._frame = -1
+        self._frame_data = memoryview(b"")
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        if offset < 0:
+            raise ValueError(f"negative seek position {offset}")
+        self._position = offset
+        return offset
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        written = 0
+        while written < len(view) and self._position < self._size:
+            frame = bisect_right(self._starts, self._position) - 1
+            if frame != self._frame:
+                start, end = self._frames[frame][1], self._frames[frame + 1][1]
+                self._file.seek(start)
+                self._frame_data = memoryview(
+                    self._decompressor.decompress(self._file.read(end - start))
+                )
+                self._frame = frame
+            chunk = self._frame_data[
+                self._position - self._starts[frame] :
+            ][: len(view) - written]
+            if not chunk:
+                break
+            view[written : written + len(chunk)] = chunk
+            written += len(chunk)
+            self._position += len(chunk)
+        return written
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+def _open_log_sync(path: Path):
+    """
+    以二进制方式打开日志文件
+
+    压缩文件按索引中的帧表随机读取，读取逻辑与未压缩文件一致；没有帧表的
+    压缩文件（单帧压缩的旧文件）整体解压到内存中。未压缩文件在打开前刚好
+    被压缩时，改为打开压缩后的文件。
+    """
+    if path.name.endswith(_COMPRESSED_SUFFIX):
+        frames = _read_frame_table(_index_path(path))
+        if frames is not None:
+            return _ZstdFrameReader(path, frames)
+        with open(path, "rb") as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(f)
+            return io.BytesIO(reader.read())
+    try:
+        return open(path, "rb")
+    except FileNotFoundError:
+        compressed = _compressed_path(path)
+        if ZSTD_AVAILABLE and compressed.exists():
+            return _open_log_sync(compressed)
+        raise
+
+
+def _iter_lines(f, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+    """按块读取文件 [start, end) 区间，逐行产出（不含换行符）"""
+    f.seek(start)
+    remaining = end - start if end is not None else None
+    buffer = b""
+    while remaining is None or remaining > 0:
+        size = _READ_CHUNK_SIZE
+        if remaining is not None:
+            size = min(remaining, size)
+        data = f.read(size)
+        if not data:
+            break
+        if remaining is not None:
+            remaining -= len(data)
+        *lines, buffer = (buffer + data).split(b"\n")
+        yield from lines
+    if buffer:
+        yield buffer
+
+
+def _iter_lines_reversed(f) -> Iterator[bytes]:
+    """从文件末尾按块向前读取，倒序逐行产出（不含换行符）"""
+    position = f.seek(0, 2)
+    buffer = b""
+    while position > 0:
+        size = min(position, _READ_CHUNK_SIZE)
+        position -= size
+        f.seek(position)
+        # 块的第一段可能是不完整的行，留到读取前一块时拼接
+        buffer, *lines = (f.read(size) + buffer).split(b"\n")
+        yield from reversed(lines)
+    yield buffer
+
+
+def _open_append_sync(log_file: Path):
+    """
+    在线程中以追加模式打开日志文件及其索引文件
+
+    Returns:
+        (日志文件句柄, 索引文件句柄, 日志文件当前大小)
+    """
+    log_handle = open(log_file, "ab")
+    try:
+        index_handle = open(_index_path(log_file), "ab")
+    except Exception:
+        log_handle.close()
+        raise
+    try:
+        offset = log_handle.tell()
+        if index_handle.tell() < _INDEX_HEADER.size:
+            # 新建的索引只覆盖从当前文件末尾开始写入的记录
+            index_handle.truncate(0)
+            index_handle.write(_INDEX_HEADER.pack(offset))
+        else:
+            _repair_index_sync(log_file, index_handle, offset)
+    except Exception:
+        _close_handles_sync(log_handle, index_handle)
+        raise
+    return log_handle, index_handle, offset
+
+
+def _repair_index_sync(log_file: Path, index_handle, log_size: int) -> None:
+    """
+    补齐索引末尾缺失的条目
+
+    写入日志成功但写入索引失败（或进程在两次写入之间退出）时，
+    这些记录只存在于日志文件中；重新打开时为它们补建索引，
+    避免之后追加的条目把它们夹在索引中间而无法查到。
+    """
+    index_size = index_handle.tell()
+    entry_count = (index_size - _INDEX_HEADER.size) // _INDEX_ENTRY.size
+    aligned_size = _INDEX_HEADER.size + entry_count * _INDEX_ENTRY.size
+
+    with open(_index_path(log_file), "rb") as f:
+        if entry_count:
+            f.seek(aligned_size - _INDEX_ENTRY.size)
+            _, offset, length = _INDEX_ENTRY.unpack(f.read(_INDEX_ENTRY.size))
+            indexed_end = offset + length
+        else:
+            (indexed_end,) = _INDEX_HEADER.unpack(f.read(_INDEX_HEADER.size))
+
+    if aligned_size != index_size:
+        # 丢弃写了一半的条目
+        index_handle.truncate(aligned_size)
+    if indexed_end >= log_size:
+        return
+
+    entries = bytearray()
+    position = indexed_end
+    with open(log_file, "rb") as f:
+        for line in _iter_lines(f, indexed_end, log_size):
+            length = min(len(line) + 1, log_size - position)
+            try:
+                key = uuid.UUID(orjson.loads(line)["log_id"]).bytes
+            except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+                key = None
+            if key is not None:
+                entries += _INDEX_ENTRY.pack(key, position, length)
+            position += length
+
+    index_handle.write(entries)
+    index_handle.flush()
+    logger.info(
+        f"Reindexed {len(entries) // _INDEX_ENTRY.size} log records in {log_file.name}"
+    )
+
+
+def _append_batch_sync(log_handle, index_handle, data, index_data) -> None:
+    """在线程中写入一批日志及其索引项，flush 后查询即可读到"""
+    log_handle.write(data)
+    log_handle.flush()
+    index_handle.write(index_data)
+    index_handle.flush()
+
+
+def _close_handles_sync(*handles) -> None:
+    """在线程中关闭文件句柄"""
+    for handle in handles:
+        if handle is not None:
+            handle.close()
+
+
+def _build_log_filters(
+    session_id: Optional[str], status: Optional[str]
+) -> Tuple[Optional[Callable[[bytes], bool]], Optional[Callable[[Dict], bool]]]:
+    """
+    按过滤条件的组合生成专用的过滤函数，避免在逐行循环中判断条件是否设置
+
+    Returns:
+        (原始行的字节预过滤函数, 解析后记录的过滤函数)，未设置任何条件时均为 None。
+        预过滤只要求值编码后的 JSON 字符串出现在行中而不带键名，
+        以兼容旧日志 json.dumps 写出的 "key": "value" 格式。
+    """
+    if session_id and status:
+        session_needle = orjson.dumps(session_id)
+        status_needle = orjson.dumps(status)
+        return (
+            lambda line: session_needle in line and status_needle in line,
+            lambda log: log.get("session_id") == session_id
+            and log.get("status") == status,
+        )
+    if session_id:
+        session_needle = orjson.dumps(session_id)
+        return (
+            lambda line: session_needle in line,
+            lambda log: log.get("session_id") == session_id,
+        )
+    if status:
+        status_needle = orjson.dumps(status)
+        return (
+            lambda line: status_needle in line,
+            lambda log: log.get("status") == status,
+        )
+    return None, None
+
+
+def _scan_file_sync(
+    path: Path, session_id: Optional[str], status: Optional[str], limit: int
+) -> List[Dict[str, Any]]:
+    """
+    在线程中从文件末尾向前读取日志，返回最多 limit 条满足过滤条件的记录
+
+    日志按写入顺序追加，倒序读取即按时间戳从新到旧，凑够 limit 条即停止。
+    """
+    logs = []
+    if limit <= 0:
+        return logs
+
+    # 解析 JSON 前先按字节预过滤，解析后再精确匹配过滤条件
+    line_filter, log_filter = _build_log_filters(session_id, status)
+
+    with _open_log_sync(path) as f:
+        for line in _iter_lines_reversed(f):
+            if not line:
+                continue
+            if line_filter is not None and not line_filter(line):
+                continue
+            try:
+                log = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+
+            # 应用过滤条件
+            if log_filter is not None and not log_filter(log):
+                continue
+
+            logs.append(log)
+            if len(logs) >= limit:
+                break
+    return logs
+
+
+def _find_in_range(
+    f, log_id: str, start: int, end: Optional[int]
+) -> Optional[Dict[str, Any]]:
+    """逐行扫描 JSONL 文件 [start, end) 区间，查找指定 log_id 的记录"""
+    for line in _iter_lines(f, start, end):
+        if not line:
+            continue
+        try:
+            log = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            continue
+        if log.get("log_id") == log_id:
+            return log
+    return None
+
+
+def _find_log_sync(path: Path, log_id: str) -> Optional[Dict[str, Any]]:
+    """
+    在线程中查找日志文件中指定 log_id 的记录
+
+    有索引文件时直接定位读取，只对索引未覆盖的区间逐行扫描；
+    没有索引文件（旧日志）时扫描整个文件。
+    """
+    index_file = _index_path(path)
+    with _open_log_sync(path) as f:
+        if not index_file.exists():
+            return _find_in_range(f, log_id, 0, None)
+
+        index = index_file.read_bytes()
+        # 压缩后的索引末尾带有帧表，条目只查找到帧表之前
+        entries_limit, _ = _split_frame_table(index)
+        if len(index) < _INDEX_HEADER.size:
+            return _find_in_range(f, log_id, 0, None)
+        (indexed_from,) = _INDEX_HEADER.unpack_from(index)
+
+        try:
+            key = uuid.UUID(log_id).bytes
+        except ValueError:
+            key = None
+
+        if key is not None:
+            position = index.find(key, _INDEX_HEADER.size, entries_limit)
+            # 只接受落在条目边界上的匹配
+            while (
+                position != -1
+                and (position - _INDEX_HEADER.size) % _INDEX_ENTRY.size
+            ):
+                position = index.find(key, position + 1, entries_limit)
+
+            if position != -1:
+                _, offset, length = _INDEX_ENTRY.unpack_from(index, position)
+                f.seek(offset)
+                try:
+                    log = orjson.loads(f.read(length))
+                except orjson.JSONDecodeError:
+                    log = None
+                if isinstance(log, dict) and log.get("log_id") == log_id:
+                    return log
+
+        # 索引未覆盖的区间：建立索引之前的内容，以及最后一条索引之后的内容
+        # （例如写入日志成功但写入索引前进程退出）
+        entries_end = indexed_from
+        entry_count = (entries_limit - _INDEX_HEADER.size) // _INDEX_ENTRY.size
+        if entry_count:
+            _, offset, length = _INDEX_ENTRY.unpack_from(
+                index, _INDEX_HEADER.size + (entry_count - 1) * _INDEX_ENTRY.size
+            )
+            entries_end = offset + length
+
+        return _find_in_range(f, log_id, 0, indexed_from) or _find_in_range(
+            f, log_id, entries_end, None
+        )
+
+
+def _delete_old_logs_sync(log_dir: Path, cutoff_date: datetime) -> int:
+    """在线程中删除日期早于 cutoff_date 的日志文件和索引文件，返回删除数量"""
+    deleted_count = 0
+
+    # scandir 不会对每个条目额外 stat；文件名直接按位置解析日期
+    with os.scandir(log_dir) as entries:
+        for entry in entries:
+            name = entry.name  # 2025-12-22.jsonl
+            if not name.endswith(_LOG_FILE_SUFFIXES):
+                continue
+            # 从文件名解析日期，格式不符合的跳过
+            file_date = _parse_log_date(name)
+            if file_date is None:
+                continue
+
+            if file_date < cutoff_date:
+                os.unlink(entry.path)
+                deleted_count += 1
+                logger.info(f"Deleted old log file: {entry.path}")
+
+    return deleted_count
+
+
+def _compress_log_sync(log_file: Path) -> None:
+    """
+    将一天的日志文件压缩为多个可独立解压的 zstd 帧，并把帧表追加到索引文件
+
+    没有索引文件的旧日志同时建立一个不含条目的索引，只用于保存帧表。
+    """
+    compressed = _compressed_path(log_file)
+    tmp_file = compressed.with_name(compressed.name + ".tmp")
+    compressor = zstandard.ZstdCompressor()
+    frames = bytearray()
+    frame_start = 0
+
+    with open(log_file, "rb") as src, open(tmp_file, "wb") as dst:
+        buffer = b""
+        while True:
+            data = src.read(_COMPRESS_FRAME_SIZE)
+            buffer += data
+            if data:
+                if len(buffer) < _COMPRESS_FRAME_SIZE:
+                    continue
+                cut = buffer.rfind(b"\n") + 1
+                if not cut:
+                    # 超长的行，读到行尾再切分
+                    continue
+            else:
+                cut = len(buffer)
+                if not cut:
+                    break
+            frames += _FRAME_ENTRY.pack(frame_start, dst.tell())
+            dst.write(compressor.compress(buffer[:cut]))
+            frame_start += cut
+            buffer = buffer[cut:]
+            if not data:
+                break
+        frames += _FRAME_ENTRY.pack(frame_start, dst.tell())
+
+    index_file = _index_path(log_file)
+    try:
+        index = index_file.read_bytes()
+    except FileNotFoundError:
+        index = b""
+    if len(index) < _INDEX_HEADER.size:
+        index = _INDEX_HEADER.pack(frame_start)
+    else:
+        entries_limit, _ = _split_frame_table(index)
+        entry_count = (entries_limit - _INDEX_HEADER.size) // _INDEX_ENTRY.size
+        index = index[: _INDEX_HEADER.size + entry_count * _INDEX_ENTRY.size]
+
+    tmp_index = index_file.with_name(index_file.name + ".tmp")
+    with open(tmp_index, "wb") as f:
+        f.write(index)
+        f.write(frames)
+        f.write(
+            _FRAME_FOOTER.pack(len(frames) // _FRAME_ENTRY.size, _FRAME_MAGIC)
+        )
+
+    # 先替换出带帧表的索引和压缩文件再删除原文件，读取方任何时刻都能找到
+    # 其中之一，且打开压缩文件时索引中已有帧表
+    os.replace(tmp_index, index_file)
+    os.replace(tmp_file, compressed)
+    os.unlink(log_file)
+
+
+def _compress_old_logs_sync(log_dir: Path, before: datetime) -> int:
+    """在线程中将日期早于 before 的未压缩日志文件压缩为 zstd，返回压缩数量"""
+    compressed_count = 0
+
+    with os.scandir(log_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.endswith(".jsonl"):
+                continue
+            file_date = _parse_log_date(name)
+            if file_date is None or file_date >= before:
+                continue
+
+            log_file = Path(entry.path)
+            _compress_log_sync(log_file)
+            compressed_count += 1
+            logger.info(f"Compressed old log file: {log_file}")
+
+    return compressed_count
 
 
 class ConversationLogger:
     """对话日志记录服务"""
 
-    def __init__(self, log_dir: Path, retention_days: int = 30):
+    def __init__(
+        self, log_dir: Path, retention_days: int = 30, compress: bool = False
+    ):
         """
         初始化对话日志记录器
 
         Args:
             log_dir: 日志目录路径
             retention_days: 日志保留天数
+            compress: 是否用 zstd 压缩过去日期的日志文件
         """
         self.log_dir = log_dir
         self.retention_days = retention_days
+        if compress and not ZSTD_AVAILABLE:
+            logger.warning(
+                "Conversation log compression requires zstandard; "
+                "install it with: pip install zstandard"
+            )
+        self.compress = compress and ZSTD_AVAILABLE
+        self._compress_task: Optional[asyncio.Task] = None
         self.log_dir.mkdir(parents=True, exist_ok=True)
         self._cleanup_task: Optional[asyncio.Task] = None
         self._cleanup_interval = 86400  # 每天清理一次（秒）
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=10_000)
+        self._pending: List[Dict[str, Any]] = []
+        self._writer_task: Optional[asyncio.Task] = None
+        self._batch_size = 256  # 单次写入的最大记录数
+        self._flush_interval = 0.05  # 攒批等待时间（秒）
+        self._log_handle = None  # 当天日志文件的追加句柄，跨批次复用
+        self._index_handle = None  # 当天索引文件的追加句柄
+        self._log_handle_path: Optional[Path] = None
+        self._log_offset = 0  # 下一条记录在当天日志文件中的偏移
+        self._write_buffer = bytearray()  # 每批复用的序列化缓冲区
+        self._index_buffer = bytearray()
+        self._scan_concurrency = 4  # 查询时同时扫描的日志文件数
+        self._current_date: Optional[date_type] = None  # 当天日志文件路径的缓存
+        self._current_log_file: Optional[Path] = None
+        self._random_pool = b""  # 生成 log_id 用的随机字节池
+        self._random_offset = 0
         logger.info(f"Conversation logger initialized at {self.log_dir}")
 
     def _get_log_file(self, date: Optional[datetime] = None) -> Path:
@@ -37,10 +673,74 @@ class ConversationLogger:
             日志文件路径
         """
         if date is None:
-            date = datetime.now()
+            # 当天的路径按日期缓存，跨天时重新生成
+            today = date_type.today()
+            if today != self._current_date:
+                self._current_log_file = (
+                    self.log_dir / f"{today.strftime('%Y-%m-%d')}.jsonl"
+                )
+                self._current_date = today
+            return self._current_log_file
         date_str = date.strftime("%Y-%m-%d")
         return self.log_dir / f"{date_str}.jsonl"
 
+    def _find_existing_log_file(self, date: datetime) -> Optional[Path]:
+        """
+        获取指定日期实际存在的日志文件，未压缩的文件不存在时查找压缩后的文件
+
+        Args:
+            date: 日期对象
+
+        Returns:
+            日志文件路径，如果当天没有日志返回 None
+        """
+        log_file = self._get_log_file(date)
+        if log_file.exists():
+            return log_file
+        compressed = _compressed_path(log_file)
+        if ZSTD_AVAILABLE and compressed.exists():
+            return compressed
+        return None
+
+    def _take_random_bytes(self, size: int) -> bytes:
+        """从随机字节池中取出 size 字节，用完时一次性重新读取一批"""
+        if self._random_offset + size > len(self._random_pool):
+            self._random_pool = os.urandom(_RANDOM_POOL_SIZE)
+            self._random_offset = 0
+        start = self._random_offset
+        self._random_offset += size
+        return self._random_pool[start : start + size]
+
+    def enqueue(self, log_data: Dict[str, Any]) -> str:
+        """
+        将一次完整对话放入写入队列，由后台任务批量落盘
+
+        不会阻塞调用方；队列已满时丢弃该条记录。
+
+        Args:
+            log_data: 对话数据
+
+        Returns:
+            log_id: 日志唯一标识，丢弃时返回空字符串
+        """
+        # 添加基础元数据
+        # 使用按时间排序的 UUIDv7，查询时可直接从 log_id 得知所在日期；
+        # log_id 与 timestamp 共用一次时间读取
+        now_ns = time.time_ns()
+        log_id = str(_uuid7(now_ns, self._take_random_bytes(10)))
+        log_data["log_id"] = log_id
+        log_data["timestamp"] = (
+            _UNIX_EPOCH + timedelta(microseconds=now_ns // 1000)
+        ).isoformat() + "Z"
+
+        try:
+            self._queue.put_nowait(log_data)
+        except asyncio.QueueFull:
+            logger.warning(f"Conversation log queue is full, dropping log: {log_id}")
+            return ""
+
+        return log_id
+
     async def log_conversation(self, log_data: Dict[str, Any]) -> str:
         """
         记录一次完整对话
@@ -51,27 +751,139 @@ class ConversationLogger:
         Returns:
             log_id: 日志唯一标识
         """
+        return self.enqueue(log_data)
+
+    async def _collect_batch(self) -> None:
+        """等待第一条记录，然后在短时间窗口内继续攒批"""
+        self._pending.append(await self._queue.get())
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._flush_interval
+        while len(self._pending) < self._batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                self._pending.append(
+                    await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                )
+            except asyncio.TimeoutError:
+                break
+
+    async def _flush_pending(self) -> None:
+        """将已攒批的记录（以及队列中剩余的记录）一次性写入当天的日志文件"""
+        while not self._queue.empty():
+            self._pending.append(self._queue.get_nowait())
+
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+
+        # 确保当天的日志文件已打开（追加模式）
+        await self._ensure_log_handle()
+
+        # 整批记录序列化到复用的缓冲区，索引项同时按记录偏移生成
+        buffer = self._write_buffer
+        index_buffer = self._index_buffer
+        buffer.clear()
+        index_buffer.clear()
+        count = 0
+        for log_data in batch:
+            try:
+                line = orjson.dumps(log_data, default=_pydantic_default)
+            except TypeError as e:
+                logger.error(
+                    f"Failed to serialize conversation log {log_data.get('log_id')}: {e}"
+                )
+                continue
+
+            offset = self._log_offset + len(buffer)
+            buffer += line
+            buffer += b"\n"
+            count += 1
+            try:
+                index_buffer += _INDEX_ENTRY.pack(
+                    uuid.UUID(log_data.get("log_id")).bytes, offset, len(line) + 1
+                )
+            except (TypeError, ValueError):
+                pass
+
+        if not count:
+            return
+
         try:
-            # 添加基础元数据
-            log_id = str(uuid.uuid4())
-            log_data["log_id"] = log_id
-            log_data["timestamp"] = datetime.utcnow().isoformat() + "Z"
+            # 日志与索引的写入在一次线程调度中完成
+            await asyncio.to_thread(
+                _append_batch_sync,
+                self._log_handle,
+                self._index_handle,
+                buffer,
+                index_buffer,
+            )
+            self._log_offset += len(buffer)
+        except Exception:
+            # 写入失败时丢弃句柄，下一批重新打开
+            await self._close_log_handle()
+            raise
 
-            # 获取当天的日志文件
-            log_file = self._get_log_file()
+        logger.debug(f"Logged {count} conversations")
 
-            # 异步写入日志（追加模式）
-            async with aiofiles.open(log_file, "a", encoding="utf-8") as f:
-                await f.write(json.dumps(log_data, ensure_ascii=False) + "\n")
+    async def _ensure_log_handle(self) -> None:
+        """确保当天日志文件的追加句柄已打开，仅在日期切换时重新打开"""
+        log_file = self._get_log_file()
+        if self._log_handle_path != log_file:
+            await self._close_log_handle()
+            (
+                self._log_handle,
+                self._index_handle,
+                self._log_offset,
+            ) = await asyncio.to_thread(_open_append_sync, log_file)
+            self._log_handle_path = log_file
 
-            logger.debug(f"Logged conversation: {log_id}")
-            return log_id
+            # 开始写入新一天的文件时，在后台压缩之前各天的日志
+            if self.compress and (
+                self._compress_task is None or self._compress_task.done()
+            ):
+                self._compress_task = asyncio.create_task(self.compress_old_logs())
 
-        except Exception as e:
-            logger.error(f"Failed to log conversation: {e}")
-            return ""
+    async def _close_log_handle(self) -> None:
+        """关闭当前的日志文件句柄"""
+        if self._log_handle is not None or self._index_handle is not None:
+            await asyncio.to_thread(
+                _close_handles_sync, self._log_handle, self._index_handle
+            )
+        self._log_handle = None
+        self._index_handle = None
+        self._log_handle_path = None
 
-    async def query_logs(
+    async def _writer_loop(self):
+        """
+        后台写入循环
+
+        只有攒批阶段可以被取消（已取出的记录留在 _pending 中）；写入阶段
+        不会被打断，停止时先等待正在进行的写入完成再退出，避免与
+        stop_writer_task 中的最后一次写入同时操作文件句柄和缓冲区。
+        """
+        while True:
+            try:
+                await self._collect_batch()
+            except asyncio.CancelledError:
+                break
+
+            flush = asyncio.ensure_future(self._flush_pending())
+            try:
+                await asyncio.shield(flush)
+            except asyncio.CancelledError:
+                try:
+                    await flush
+                except Exception as e:
+                    logger.error(f"Failed to log conversation: {e}")
+                break
+            except Exception as e:
+                logger.error(f"Failed to log conversation: {e}")
+
+    async def iter_logs(
         self,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
@@ -79,9 +891,12 @@ class ConversationLogger:
         status: Optional[str] = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> List[Dict[str, Any]]:
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        查询日志记录
+        按时间戳从新到旧逐条产出日志记录
+
+        每并发扫描完一批日期的文件，就产出其中位置已经确定的记录，
+        不必等所有文件扫描完毕；查询失败时记录错误并结束迭代。
 
         Args:
             start_date: 开始日期 (YYYY-MM-DD)
@@ -91,8 +906,8 @@ class ConversationLogger:
             limit: 返回数量限制
             offset: 偏移量
 
-        Returns:
-            日志记录列表
+        Yields:
+            日志记录
         """
         try:
             # 确定查询的日期范围
@@ -106,41 +921,111 @@ class ConversationLogger:
             else:
                 end = datetime.now()
 
-            logs = []
-            current_date = start
+            # 从最新的一天向前排列存在的日志文件
+            log_files = []
+            current_date = end
+            while current_date.date() >= start.date():
+                log_file = self._find_existing_log_file(current_date)
+                if log_file is not None:
+                    log_files.append((current_date, log_file))
+                current_date -= timedelta(days=1)
 
-            # 遍历日期范围内的所有日志文件
-            while current_date <= end:
-                log_file = self._get_log_file(current_date)
+            # 已扫描但可能被更早文件中的记录排到前面的记录
+            pending: List[Dict[str, Any]] = []
+            needed = offset + limit
+            produced = 0
 
-                if log_file.exists():
-                    async with aiofiles.open(log_file, "r", encoding="utf-8") as f:
-                        async for line in f:
-                            try:
-                                log = json.loads(line.strip())
+            # 每次并发扫描若干天的文件，取够 offset + limit 条即停止
+            for i in range(0, len(log_files), self._scan_concurrency):
+                if produced >= needed:
+                    break
+                window = log_files[i : i + self._scan_concurrency]
+                results = await asyncio.gather(
+                    *[
+                        asyncio.to_thread(
+                            _scan_file_sync,
+                            log_file,
+                            session_id,
+                            status,
+                            needed - produced,
+                        )
+                        for _, log_file in window
+                    ]
+                )
+                # 各文件的结果均已按时间戳倒序，归并后只保留还需要的条数，
+                # 跨天边界附近时间戳交错的记录也能排在正确位置
+                merged = list(
+                    islice(
+                        heapq.merge(
+                            pending, *results, key=_log_timestamp, reverse=True
+                        ),
+                        needed - produced,
+                    )
+                )
 
-                                # 应用过滤条件
-                                if session_id and log.get("session_id") != session_id:
-                                    continue
-                                if status and log.get("status") != status:
-                                    continue
+                # 更早日期的文件中只有本批最早一天零点 (UTC) 之前的记录，
+                # 不早于这一时刻的记录位置已经确定
+                day_start = datetime.combine(
+                    window[-1][0].date(), datetime.min.time()
+                )
+                boundary = (
+                    _UNIX_EPOCH + timedelta(seconds=day_start.timestamp())
+                ).isoformat()
+                settled = 0
+                while (
+                    settled < len(merged)
+                    and _log_timestamp(merged[settled]) >= boundary
+                ):
+                    settled += 1
+                pending = merged[settled:]
 
-                                logs.append(log)
+                for log in merged[:settled]:
+                    if produced >= offset:
+                        yield log
+                    produced += 1
 
-                            except json.JSONDecodeError:
-                                continue
+            for log in pending[: needed - produced]:
+                if produced >= offset:
+                    yield log
+                produced += 1
 
-                current_date += timedelta(days=1)
+        except Exception as e:
+            logger.error(f"Failed to query logs: {e}")
 
-            # 按时间戳倒序排序
-            logs.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+    async def query_logs(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        session_id: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        查询日志记录
 
-            # 应用分页
-            return logs[offset : offset + limit]
+        Args:
+            start_date: 开始日期 (YYYY-MM-DD)
+            end_date: 结束日期 (YYYY-MM-DD)
+            session_id: 会话 ID
+            status: 状态过滤 (success/error)
+            limit: 返回数量限制
+            offset: 偏移量
 
-        except Exception as e:
-            logger.error(f"Failed to query logs: {e}")
-            return []
+        Returns:
+            日志记录列表（按时间戳倒序）
+        """
+        return [
+            log
+            async for log in self.iter_logs(
+                start_date=start_date,
+                end_date=end_date,
+                session_id=session_id,
+                status=status,
+                limit=limit,
+                offset=offset,
+            )
+        ]
 
     async def get_log_by_id(self, log_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -153,20 +1038,23 @@ class ConversationLogger:
             日志记录，如果未找到返回 None
         """
         try:
-            # 搜索最近 7 天的日志文件
-            for i in range(7):
-                date = datetime.now() - timedelta(days=i)
-                log_file = self._get_log_file(date)
-
-                if log_file.exists():
-                    async with aiofiles.open(log_file, "r", encoding="utf-8") as f:
-                        async for line in f:
-                            try:
-                                log = json.loads(line.strip())
-                                if log.get("log_id") == log_id:
-                                    return log
-                            except json.JSONDecodeError:
-                                continue
+            created_at = _uuid7_datetime(log_id)
+            if created_at is not None:
+                # UUIDv7 自带生成时间，只需查看当天的文件；
+                # 临近午夜生成的记录可能在跨天后才写入下一天的文件
+                dates = [created_at, created_at + timedelta(days=1)]
+            else:
+                # 旧日志的 UUIDv4：从当天开始搜索最近 7 天的日志文件
+                now = datetime.now()
+                dates = [now - timedelta(days=i) for i in range(7)]
+
+            for date in dates:
+                log_file = self._find_existing_log_file(date)
+
+                if log_file is not None:
+                    log = await asyncio.to_thread(_find_log_sync, log_file, log_id)
+                    if log is not None:
+                        return log
 
             return None
 
@@ -183,21 +1071,11 @@ class ConversationLogger:
         """
         try:
             cutoff_date = datetime.now() - timedelta(days=self.retention_days)
-            deleted_count = 0
 
-            for log_file in self.log_dir.glob("*.jsonl"):
-                try:
-                    # 从文件名解析日期
-                    file_date_str = log_file.stem  # 2025-12-22
-                    file_date = datetime.strptime(file_date_str, "%Y-%m-%d")
-
-                    if file_date < cutoff_date:
-                        log_file.unlink()
-                        deleted_count += 1
-                        logger.info(f"Deleted old log file: {log_file}")
-                except ValueError:
-                    # 文件名格式不符合，跳过
-                    continue
+            # 目录遍历与删除在一次线程调度中完成，不阻塞事件循环
+            deleted_count = await asyncio.to_thread(
+                _delete_old_logs_sync, self.log_dir, cutoff_date
+            )
 
             if deleted_count > 0:
                 logger.info(f"Cleaned up {deleted_count} old log files")
@@ -208,6 +1086,28 @@ class ConversationLogger:
             logger.error(f"Failed to cleanup old logs: {e}")
             return 0
 
+    async def compress_old_logs(self) -> int:
+        """
+        用 zstd 压缩当天之前的日志文件
+
+        Returns:
+            压缩的文件数量
+        """
+        try:
+            today = datetime.combine(date_type.today(), datetime.min.time())
+            compressed_count = await asyncio.to_thread(
+                _compress_old_logs_sync, self.log_dir, today
+            )
+
+            if compressed_count > 0:
+                logger.info(f"Compressed {compressed_count} old log files")
+
+            return compressed_count
+
+        except Exception as e:
+            logger.error(f"Failed to compress old logs: {e}")
+            return 0
+
     async def start_cleanup_task(self):
         """启动定时清理任务"""
         if self._cleanup_task is None:
@@ -225,26 +1125,64 @@ class ConversationLogger:
             self._cleanup_task = None
             logger.info("Conversation log cleanup task stopped")
 
+    async def start_writer_task(self):
+        """启动后台写入任务"""
+        if self._writer_task is None:
+            self._writer_task = asyncio.create_task(self._writer_loop())
+            logger.info("Conversation log writer task started")
+
+    async def stop_writer_task(self):
+        """停止后台写入任务，并写入剩余的日志"""
+        if self._writer_task:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+            logger.info("Conversation log writer task stopped")
+
+        try:
+            await self._flush_pending()
+        except Exception as e:
+            logger.error(f"Failed to flush conversation logs: {e}")
+        finally:
+            await self._close_log_handle()
+
+        if self._compress_task is not None:
+            await self._compress_task
+            self._compress_task = None
+
     async def _cleanup_loop(self):
         """定时清理循环"""
+        loop = asyncio.get_running_loop()
+        # 按固定的单调时钟目标时间调度，清理耗时不会累积成漂移
+        next_run = loop.time() + self._cleanup_interval
         while True:
             try:
-                await asyncio.sleep(self._cleanup_interval)
+                await asyncio.sleep(max(0.0, next_run - loop.time()))
                 await self.cleanup_old_logs()
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error in cleanup loop: {e}")
 
+            next_run += self._cleanup_interval
+            if next_run <= loop.time():
+                # 错过了整个周期（如事件循环长时间阻塞），不再补跑
+                next_run = loop.time() + self._cleanup_interval
+
 
 # 全局单例
 _conversation_logger: Optional[ConversationLogger] = None
 
 
-def init_conversation_logger(log_dir: Path, retention_days: int = 30):
+def init_conversation_logger(
+    log_dir: Path, retention_days: int = 30, compress: bool = False
+):
     """初始化全局对话日志记录器"""
     global _conversation_logger
-    _conversation_logger = ConversationLogger(log_dir, retention_days)
+    _conversation_logger = ConversationLogger(log_dir, retention_days, compress)
     logger.info("Global conversation logger initialized")
 
 
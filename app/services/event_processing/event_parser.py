@@ -118,6 +118,14 @@ class EventParser:
             streaming_event = StreamingEvent(
                 root=UnknownEvent(type=sse_msg.event, data=data)
             )
+        else:
+            # Content deltas are never modified in place downstream; keep the
+            # original payload (if it is a single line) to forward as-is
+            if (
+                streaming_event.root.type == "content_block_delta"
+                and "\n" not in sse_msg.data
+            ):
+                streaming_event._raw_data = sse_msg.data.encode()
 
         return streaming_event
 
@@ -1,8 +1,23 @@
-import json
+from functools import lru_cache
 from typing import AsyncIterator, Optional
 
+import orjson
+from pydantic import TypeAdapter
+
 from app.models.streaming import StreamingEvent, UnknownEvent
 
+# Encodes straight to JSON bytes in pydantic-core
+_EVENT_ADAPTER = TypeAdapter(StreamingEvent)
+
+_SSE_DATA_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+
+
+@lru_cache(maxsize=64)
+def _sse_prefix(event_type: str) -> bytes:
+    """Build (and cache) the "event:" line plus "data: " prefix for an event type."""
+    return b"event: " + event_type.encode() + b"\n" + _SSE_DATA_PREFIX
+
 
 class EventSerializer:
     """Serializes StreamingEvent objects into SSE (Server-Sent Events) format."""
@@ -12,7 +27,7 @@ class EventSerializer:
 
     async def serialize_stream(
         self, events: AsyncIterator[StreamingEvent]
-    ) -> AsyncIterator[str]:
+    ) -> AsyncIterator[bytes]:
         """
         Serialize a stream of StreamingEvent objects into SSE format.
 
@@ -20,14 +35,14 @@ class EventSerializer:
             events: AsyncIterator that yields StreamingEvent objects
 
         Yields:
-            String chunks in SSE format
+            Bytes chunks in SSE format
         """
         async for event in events:
             sse_message = self.serialize_event(event)
             if sse_message:
                 yield sse_message
 
-    def serialize_event(self, event: StreamingEvent) -> Optional[str]:
+    def serialize_event(self, event: StreamingEvent) -> Optional[bytes]:
         """
         Serialize a single StreamingEvent into SSE format.
 
@@ -35,39 +50,33 @@ class EventSerializer:
             event: StreamingEvent object to serialize
 
         Returns:
-            SSE formatted string or None if serialization fails
+            SSE formatted bytes or None if serialization fails
         """
-        if isinstance(event.root, UnknownEvent):
+        if event._raw_data is not None:
+            # Forward the upstream payload instead of re-encoding it
+            json_data = event._raw_data
+        elif isinstance(event.root, UnknownEvent):
             if self.skip_unknown_events:
                 return None
-            json_data = json.dumps(
-                event.root.data, ensure_ascii=False, separators=(",", ":")
-            )
+            json_data = orjson.dumps(event.root.data)
         else:
-            json_data = event.model_dump_json(exclude_none=True)
-
-        sse_parts = []
+            json_data = _EVENT_ADAPTER.dump_json(event, exclude_none=True)
 
+        # Compact JSON never contains a raw newline, so the payload always
+        # fits on a single "data:" line
         if event.root.type:
-            sse_parts.append(f"event: {event.root.type}")
-
-        data_lines = json_data.split("\n")
-        for line in data_lines:
-            sse_parts.append(f"data: {line}")
-
-        sse_message = "\n".join(sse_parts) + "\n\n"
-
-        return sse_message
+            return _sse_prefix(event.root.type) + json_data + _SSE_SUFFIX
+        return _SSE_DATA_PREFIX + json_data + _SSE_SUFFIX
 
-    async def serialize_batch(self, events: list[StreamingEvent]) -> str:
+    async def serialize_batch(self, events: list[StreamingEvent]) -> bytes:
         """
-        Serialize a batch of StreamingEvent objects into a single SSE string.
+        Serialize a batch of StreamingEvent objects into a single SSE payload.
 
         Args:
             events: List of StreamingEvent objects to serialize
 
         Returns:
-            Concatenated SSE formatted string
+            Concatenated SSE formatted bytes
         """
         result_parts = []
 
@@ -76,4 +85,4 @@ class EventSerializer:
             if sse_message:
                 result_parts.append(sse_message)
 
-        return "".join(result_parts)
+        return b"".join(result_parts)
@@ -13,6 +13,41 @@ from app.core.exceptions import (
     NetworkSSLError,
 )
 
+_KIND_RE = re.compile(r'kind:\s*(\w+)')
+
+# Lowercased substrings of every marker _CLASSIFY_RE looks for; an error
+# string containing none of them can only fall through to its kind
+_MARKERS = ("ssl", "tls", "certificate", "timedout", "timeout", "connect")
+
+# Classifies an rnet error string in a single scan. Every alternative is a
+# zero-width lookahead so matches never consume text another one needs
+# (e.g. "kind: Connect" is both the kind and the connection marker), and no
+# two alternatives can start at the same position. The group name of each
+# match tells which marker or detail was found.
+_CLASSIFY_RE = re.compile(
+    r'(?=kind:\s*(?P<kind>\w+))'
+    r'|(?=reason:\s*"(?P<reason>[^"]+)")'
+    r'|(?=verify_result:\s*Err\([^:]+:\s*"(?P<verify>[^"]+)")'
+    r'|(?=(?P<ssl>SSL|TLS|(?i:certificate)))'
+    r'|(?=(?P<timeout>TimedOut|(?i:timeout)))'
+    r'|(?=(?P<connect>Connect))'
+)
+_URI_RE = re.compile(r'uri:\s*(https?://[^\s,}]+)')
+_URL_RE = re.compile(r'(https?://[^\s,}]+)')
+
+# Exception type names routed to the rnet error parser
+_RNET_EXC_NAMES = frozenset({"ConnectionError", "BodyError"})
+
+# Standard exception type names and the AppError they map to. Matched by
+# name rather than by class so rnet's own TimeoutError/ConnectionResetError
+# are covered too. ConnectionError is absent because the rnet branch
+# already claims it.
+_STANDARD_EXC_KINDS = {
+    "TimeoutError": NetworkTimeoutError,
+    "ConnectionRefusedError": NetworkConnectionError,
+    "ConnectionResetError": NetworkConnectionError,
+}
+
 
 def parse_rnet_error(error_str: str) -> tuple[str, str]:
     """
@@ -24,30 +59,31 @@ def parse_rnet_error(error_str: str) -> tuple[str, str]:
     Returns:
         Tuple of (error_type, error_details)
     """
-    # Extract kind from the error string
-    kind_match = re.search(r'kind:\s*(\w+)', error_str)
-    error_type = kind_match.group(1) if kind_match else "Unknown"
-
-    # Extract more specific details
-    if "SSL" in error_str or "TLS" in error_str or "certificate" in error_str.lower():
-        # Extract SSL-specific error details
-        reason_match = re.search(r'reason:\s*"([^"]+)"', error_str)
-        if reason_match:
-            return "SSL", reason_match.group(1)
-
-        verify_match = re.search(r'verify_result:\s*Err\([^:]+:\s*"([^"]+)"', error_str)
-        if verify_match:
-            return "SSL", verify_match.group(1)
-
-        return "SSL", "SSL/TLS handshake failed"
-
-    if "TimedOut" in error_str or "timeout" in error_str.lower():
+    # Cheap substring checks first: most errors carry no marker at all
+    lowered = error_str.lower()
+    if not any(marker in lowered for marker in _MARKERS):
+        kind_match = _KIND_RE.search(error_str)
+        error_type = kind_match.group(1) if kind_match else "Unknown"
+        return error_type, f"{error_type} error occurred"
+
+    # Keep the first match of each group
+    found: dict[str, str] = {}
+    for match in _CLASSIFY_RE.finditer(error_str):
+        found.setdefault(match.lastgroup, match.group(match.lastgroup))
+
+    if "ssl" in found:
+        # Prefer the SSL reason, then the certificate verification error
+        details = found.get("reason") or found.get("verify")
+        return "SSL", details or "SSL/TLS handshake failed"
+
+    if "timeout" in found:
         return "Timeout", "Request timed out"
 
-    if "Connect" in error_str or "Connection" in error_str:
+    if "connect" in found:
         return "Connection", "Failed to establish connection"
 
     # Default: return the kind and a generic message
+    error_type = found.get("kind", "Unknown")
     return error_type, f"{error_type} error occurred"
 
 
@@ -62,12 +98,12 @@ def extract_url_from_error(error_str: str) -> Optional[str]:
         The extracted URL or None
     """
     # Try to extract URI from error string
-    uri_match = re.search(r'uri:\s*(https?://[^\s,}]+)', error_str)
+    uri_match = _URI_RE.search(error_str)
     if uri_match:
         return uri_match.group(1)
 
     # Try to extract URL from different patterns
-    url_match = re.search(r'(https?://[^\s,}]+)', error_str)
+    url_match = _URL_RE.search(error_str)
     if url_match:
         return url_match.group(1)
 
@@ -93,58 +129,64 @@ def convert_network_exception(
     error_str = str(exc)
     exc_type_name = type(exc).__name__
 
+    logger.debug(f"Converting network exception: {exc_type_name} - {error_str}")
+
+    is_rnet_error = "wreq::Error" in error_str or exc_type_name in _RNET_EXC_NAMES
+    standard_error = None if is_rnet_error else _STANDARD_EXC_KINDS.get(exc_type_name)
+
+    if not is_rnet_error and standard_error is None:
+        # Return original exception if not recognized
+        logger.debug(
+            f"Network exception not recognized, returning original: {exc_type_name}"
+        )
+        return exc
+
     # Extract URL from error string if not provided
     if not url:
         url = extract_url_from_error(error_str)
     if not url:
         url = "Unknown URL"
 
-    logger.debug(f"Converting network exception: {exc_type_name} - {error_str}")
-
-    # Handle rnet errors (ConnectionError, BodyError, etc.)
-    if "wreq::Error" in error_str or exc_type_name in ["ConnectionError", "BodyError"]:
-        error_type, error_details = parse_rnet_error(error_str)
-
-        if error_type == "SSL":
-            logger.warning(f"SSL error when accessing {url}: {error_details}")
-            return NetworkSSLError(
-                url=url,
-                ssl_error=error_details,
-                context={"operation": operation, "original_error": exc_type_name}
-            )
-
-        if error_type == "Timeout" or "TimedOut" in error_str:
-            timeout_type = "body" if operation == "streaming" else "request"
-            logger.warning(f"Timeout error ({timeout_type}) when accessing {url}")
-            return NetworkTimeoutError(
-                url=url,
-                timeout_type=timeout_type,
-                context={"operation": operation, "original_error": exc_type_name}
-            )
-
-        # Generic connection error
-        logger.warning(f"Connection error when accessing {url}: {error_details}")
-        return NetworkConnectionError(
-            url=url,
-            error_details=error_details,
-            context={"operation": operation, "original_error": exc_type_name}
-        )
-
     # Handle standard Python exceptions
-    if exc_type_name == "TimeoutError":
+    if standard_error is NetworkTimeoutError:
         return NetworkTimeoutError(
             url=url,
             timeout_type=operation,
             context={"original_error": exc_type_name}
         )
 
-    if exc_type_name in ["ConnectionError", "ConnectionRefusedError", "ConnectionResetError"]:
+    if standard_error is NetworkConnectionError:
         return NetworkConnectionError(
             url=url,
             error_details=error_str,
             context={"original_error": exc_type_name}
         )
 
-    # Return original exception if not recognized
-    logger.debug(f"Network exception not recognized, returning original: {exc_type_name}")
-    return exc
+    # Handle rnet errors (ConnectionError, BodyError, etc.)
+    error_type, error_details = parse_rnet_error(error_str)
+
+    if error_type == "SSL":
+        logger.warning(f"SSL error when accessing {url}: {error_details}")
+        return NetworkSSLError(
+            url=url,
+            ssl_error=error_details,
+            context={"operation": operation, "original_error": exc_type_name}
+        )
+
+    # parse_rnet_error reports "TimedOut" as Timeout unless SSL matched first
+    if error_type == "Timeout":
+        timeout_type = "body" if operation == "streaming" else "request"
+        logger.warning(f"Timeout error ({timeout_type}) when accessing {url}")
+        return NetworkTimeoutError(
+            url=url,
+            timeout_type=timeout_type,
+            context={"operation": operation, "original_error": exc_type_name}
+        )
+
+    # Generic connection error
+    logger.warning(f"Connection error when accessing {url}: {error_details}")
+    return NetworkConnectionError(
+        url=url,
+        error_details=error_details,
+        context={"operation": operation, "original_error": exc_type_name}
+    )
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Compile selected hot modules with Cython into in-place extension modules.
+
+The compiled ``.so``/``.pyd`` files sit next to their ``.py`` sources and are
+picked up by the import system first, so no source changes are needed. This is
+an opt-in step for source/Docker deployments; the published wheel stays pure
+Python.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+MODULES = [
+    "app/api/routes/conversation_logs.py",
+    "app/api/routes/proxies.py",
+    "app/processors/claude_ai/conversation_logging_processor.py",
+]
+
+EXTENSION_SUFFIXES = (".so", ".pyd")
+
+# FastAPI and pydantic read annotations at runtime (Query()/Depends() defaults,
+# Annotated dependencies), so Cython must not turn them into C-level type checks
+COMPILER_DIRECTIVES = {
+    "language_level": 3,
+    "binding": True,
+    "annotation_typing": False,
+}
+
+
+def clean_extensions():
+    """Remove compiled extensions and generated C files for MODULES."""
+    print("\n🧹 Removing compiled extensions...")
+    for module in MODULES:
+        source = Path(module)
+        for generated in source.parent.glob(f"{source.stem}.*"):
+            if generated.suffix in EXTENSION_SUFFIXES + (".c",):
+                generated.unlink()
+                print(f"  ✓ Removed {generated}")
+
+
+def build_extensions():
+    """Cythonize MODULES and build them in place."""
+    print("\n⚙️  Cythonizing modules...")
+
+    try:
+        from Cython.Build import cythonize
+        from setuptools import Extension, setup
+    except ImportError:
+        print("  ✗ Cython and setuptools are required: pip install -e \".[cython]\"")
+        sys.exit(1)
+
+    # Explicit dotted names: app/api/routes is a namespace package without
+    # __init__.py, so Cython cannot infer the full module path on its own
+    extensions = [
+        Extension(str(Path(module).with_suffix("")).replace("/", "."), [module])
+        for module in MODULES
+    ]
+
+    setup(
+        name="clove-proxy-ext",
+        packages=[],
+        ext_modules=cythonize(extensions, compiler_directives=COMPILER_DIRECTIVES),
+        script_args=["build_ext", "--inplace"],
+    )
+    print("  ✓ Extensions built in place")
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Compile selected Clove modules with Cython."
+    )
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="Remove previously compiled extensions instead of building",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.clean:
+        clean_extensions()
+    else:
+        build_extensions()
+
+
+if __name__ == "__main__":
+    main()